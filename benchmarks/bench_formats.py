@@ -0,0 +1,55 @@
+"""Benchmark de los formatos de datos frente al PDF.
+
+Mide reportes por segundo de DataReportExporter en JSON, CSV y HTML y de
+EnhancedReportExporter en PDF sobre los mismos resultados sintéticos. Los
+formatos de datos comparten el análisis con el PDF pero no maquetan.
+
+Uso: python benchmarks/bench_formats.py [--profile typical] [--reports 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from report_exporter import EnhancedReportExporter
+from report_formats import FORMATS, DataReportExporter
+from synthetic import PROFILES, generate_results, rules_for_profile
+
+
+def rate(payloads, render):
+    """Reportes por segundo de render sobre los payloads"""
+    render(payloads[0])
+    start = time.perf_counter()
+    for payload in payloads:
+        render(payload)
+    return len(payloads) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", default="typical", choices=sorted(PROFILES))
+    parser.add_argument("--reports", type=int, default=200)
+    args = parser.parse_args()
+
+    rules = rules_for_profile(args.profile)
+    payloads = [generate_results(args.profile, seed) for seed in range(args.reports)]
+
+    pdf_rate = rate(
+        payloads,
+        lambda p: EnhancedReportExporter(p, None, rules=rules).export_pdf_bytes(),
+    )
+    print(f"{'pdf':>5}: {pdf_rate:8.1f} reportes/s")
+    for fmt in FORMATS:
+        fmt_rate = rate(
+            payloads,
+            lambda p: DataReportExporter(p, rules=rules).export_bytes(fmt),
+        )
+        print(f"{fmt:>5}: {fmt_rate:8.1f} reportes/s ({fmt_rate / pdf_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
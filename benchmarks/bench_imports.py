@@ -0,0 +1,86 @@
+"""Benchmark de arranque en frío del análisis sin PDF.
+
+Cada corrida es un intérprete nuevo que importa report_exporter y analiza
+un resultado sintético con ReportRenderer.analyze. "lazy" es el uso actual,
+donde reportlab no se importa; "eager" importa antes los mismos módulos de
+reportlab que el exportador importaba al cargarse, como referencia. Se
+reporta la mediana del tiempo hasta tener summary_data y la memoria pico.
+
+Uso: python benchmarks/bench_imports.py [--runs 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Importaciones de reportlab que report_exporter hacía al cargarse
+EAGER_IMPORTS = """
+import reportlab.platypus, reportlab.lib.units, reportlab.lib.colors
+import reportlab.lib.pagesizes, reportlab.lib.styles
+"""
+
+# Programa de cada corrida: mide desde el arranque hasta tener summary_data
+CHILD = """
+import time
+start = time.perf_counter()
+{eager}
+import json, resource, sys
+sys.path[:0] = [{root!r}, {bench_dir!r}]
+from report_exporter import ReportRenderer
+from synthetic import generate_results
+ReportRenderer().analyze(generate_results("typical", 0))
+elapsed = time.perf_counter() - start
+print(json.dumps([
+    elapsed,
+    resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "reportlab" in sys.modules,
+]))
+"""
+
+
+def run_once(eager):
+    """Corre un intérprete nuevo y retorna sus mediciones"""
+    code = CHILD.format(
+        eager=EAGER_IMPORTS if eager else "", root=ROOT, bench_dir=BENCH_DIR
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def bench(eager, runs):
+    """Mediana del tiempo y de la memoria pico de runs corridas"""
+    samples = [run_once(eager) for _ in range(runs)]
+    return {
+        "median_ms": round(statistics.median(s[0] for s in samples) * 1000, 1),
+        "max_rss_kib": statistics.median(s[1] for s in samples),
+        "reportlab_imported": any(s[2] for s in samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    results = {"lazy": bench(False, args.runs), "eager": bench(True, args.runs)}
+    for name, result in results.items():
+        print(
+            f"{name:>5}: {result['median_ms']:7.1f} ms, "
+            f"RSS pico {result['max_rss_kib'] / 1024:.1f} MiB, "
+            f"reportlab importado: {result['reportlab_imported']}"
+        )
+    saving = results["eager"]["median_ms"] - results["lazy"]["median_ms"]
+    print(f"Ahorro en arranque en frío: {saving:.1f} ms")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark de los perfiles de salida (RENDER_PROFILES).
+
+Para cada perfil sintético renderiza los mismos payloads con cada perfil de
+salida y muestra reportes por segundo y tamaño medio del PDF, para elegir
+el balance entre CPU y bytes de cada ruta.
+
+Uso: python benchmarks/bench_profiles.py [--profiles typical many_issues]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from report_exporter import RENDER_PROFILES, EnhancedReportExporter
+from synthetic import generate_results, rules_for_profile
+
+# Repeticiones por perfil sintético; los grandes son mucho más lentos
+DEFAULT_ITERATIONS = {"many_issues": 3, "pathological": 2}
+
+
+def bench(profile, render_profile, iterations):
+    """Reportes por segundo y bytes medios de un perfil de salida"""
+    rules = rules_for_profile(profile)
+    payloads = [generate_results(profile, seed) for seed in range(iterations)]
+    EnhancedReportExporter(
+        payloads[0], None, rules=rules, profile=render_profile
+    ).export_pdf_bytes()
+
+    sizes = []
+    start = time.perf_counter()
+    for payload in payloads:
+        exporter = EnhancedReportExporter(
+            payload, None, rules=rules, profile=render_profile
+        )
+        sizes.append(len(exporter.export_pdf_bytes()))
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed, sum(sizes) / len(sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="*", default=["typical", "many_issues"])
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{'perfil':>14} {'salida':>9} {'reportes/s':>11} {'KiB':>9}")
+    for profile in args.profiles:
+        iterations = min(
+            args.iterations, DEFAULT_ITERATIONS.get(profile, args.iterations)
+        )
+        for render_profile in RENDER_PROFILES:
+            rate, size = bench(profile, render_profile, iterations)
+            print(f"{profile:>14} {render_profile:>9} {rate:11.1f} {size / 1024:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Micro-benchmark del registro de estilos compartido.
+
+Compara el costo por reporte de construir la hoja de estilos, los estilos
+personalizados y los cinco estilos de tabla de un reporte (comportamiento
+anterior) con el de obtenerlos del registro del proceso.
+
+Uso: python benchmarks/bench_styles.py [--reports N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import TableStyle
+
+import report_exporter
+from report_exporter import EnhancedReportExporter
+
+# Tablas por reporte: resumen ejecutivo más las cuatro de métricas
+TABLES_PER_REPORT = 5
+
+
+def build_styles_per_report():
+    """Reconstruye los estilos como lo hacía cada reporte"""
+    styles = getSampleStyleSheet()
+    report_exporter._create_custom_styles(styles)
+    for _ in range(TABLES_PER_REPORT):
+        TableStyle(report_exporter.TABLE_STYLE_COMMANDS)
+
+
+def build_styles_cached():
+    """Obtiene los estilos del registro compartido"""
+    exporter = EnhancedReportExporter({}, None)
+    for _ in range(TABLES_PER_REPORT):
+        exporter._get_table_style()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Calentar el registro para medir solo el régimen estable
+    build_styles_cached()
+
+    before = timeit.timeit(build_styles_per_report, number=args.reports)
+    after = timeit.timeit(build_styles_cached, number=args.reports)
+
+    print(f"Reportes simulados: {args.reports}")
+    print(f"Sin registro: {before / args.reports * 1e6:.1f} µs/reporte")
+    print(f"Con registro: {after / args.reports * 1e6:.1f} µs/reporte")
+    print(f"Ahorro: {(before - after) / args.reports * 1e6:.1f} µs/reporte")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark de variantes: una pasada de análisis frente a renders separados.
+
+Genera todas las variantes de REPORT_VARIANTS de los mismos resultados con
+un render por variante y con export_variants_bytes, y verifica que ambos
+caminos producen los mismos bytes (en modo determinista).
+
+Uso: python benchmarks/bench_variants.py [--profile typical] [--reports 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from report_exporter import REPORT_VARIANTS, ReportRenderer
+from synthetic import PROFILES, generate_results, rules_for_profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", default="typical", choices=sorted(PROFILES))
+    parser.add_argument("--reports", type=int, default=50)
+    args = parser.parse_args()
+
+    rules = rules_for_profile(args.profile)
+    payloads = []
+    for seed in range(args.reports):
+        payload = generate_results(args.profile, seed)
+        payload["analysis_date"] = "2024-01-15"
+        payloads.append(payload)
+    renderers = {
+        variant: ReportRenderer(rules=rules, deterministic=True, variant=variant)
+        for variant in REPORT_VARIANTS
+    }
+    shared = ReportRenderer(rules=rules, deterministic=True)
+    shared.render_variants_bytes(payloads[0])
+
+    start = time.perf_counter()
+    separate = [
+        {
+            variant: renderer.render_pdf_bytes(p)
+            for variant, renderer in renderers.items()
+        }
+        for p in payloads
+    ]
+    separate_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    combined = [shared.render_variants_bytes(p) for p in payloads]
+    combined_time = time.perf_counter() - start
+
+    mismatches = sum(a != b for a, b in zip(separate, combined))
+    print(f"{len(payloads)} reportes x {len(REPORT_VARIANTS)} variantes")
+    print(f"  renders separados: {separate_time * 1000 / len(payloads):.1f} ms/reporte")
+    print(f"  una pasada:        {combined_time * 1000 / len(payloads):.1f} ms/reporte")
+    print(f"  salidas distintas: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Suite de benchmarks del exportador de reportes.
+
+Para cada perfil sintético mide reportes por segundo, tiempo medio por fase
+(análisis, cada sección, doc.build) y memoria pico de un renderizado. Cada
+medición de tiempo se repite --repeats veces y se conserva la mejor corrida
+(para las fases, la mediana), porque una sola pasada está dominada por el
+ruido. Los resultados se guardan en JSON; con --baseline se comparan contra
+una corrida anterior y la suite termina con código 1 si alguna métrica
+empeora más que el umbral y más que el piso de ruido absoluto. Por defecto
+solo se comparan reportes/s (como segundos por reporte), las fases build y
+total y la memoria pico; --all-phases agrega las demás fases.
+
+Uso:
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from report_exporter import EnhancedReportExporter
+from report_metrics import InMemoryMetrics
+from synthetic import PROFILES, generate_results, rules_for_profile
+
+# Repeticiones por perfil; los patológicos son mucho más lentos
+DEFAULT_ITERATIONS = {"many_issues": 3, "pathological": 2}
+
+# Fases que se comparan por defecto: las demás son demasiado cortas y ruidosas
+GATED_PHASES = ("build", "total")
+
+# Diferencias absolutas por debajo de las cuales un cambio es ruido
+NOISE_FLOOR_SECONDS = 0.0005
+NOISE_FLOOR_BYTES = 256 * 1024
+
+
+def _timed_pass(payloads, rules):
+    """Una pasada por los payloads: (segundos, fases medias, tamaños)"""
+    metrics = InMemoryMetrics()
+    sizes = []
+    start = time.perf_counter()
+    for payload in payloads:
+        exporter = EnhancedReportExporter(payload, None, rules=rules, metrics=metrics)
+        sizes.append(len(exporter.export_pdf_bytes()))
+    elapsed = time.perf_counter() - start
+
+    phases = {}
+    for name, histogram in metrics.snapshot()["histograms"].items():
+        if name.endswith("_seconds") and histogram["count"]:
+            phases[name[: -len("_seconds")]] = histogram["sum"] / histogram["count"]
+    return elapsed, phases, sizes
+
+
+def bench_profile(profile, iterations, repeats):
+    """Mide un perfil y retorna sus resultados"""
+    rules = rules_for_profile(profile)
+    payloads = [generate_results(profile, seed) for seed in range(iterations)]
+
+    # Un render de calentamiento fuera de la medición
+    EnhancedReportExporter(payloads[0], None, rules=rules).export_pdf_bytes()
+
+    passes = [_timed_pass(payloads, rules) for _ in range(repeats)]
+    elapsed = min(p[0] for p in passes)
+    sizes = passes[0][2]
+    phases = {
+        phase: statistics.median(p[1][phase] for p in passes if phase in p[1])
+        for phase in passes[0][1]
+    }
+
+    tracemalloc.start()
+    EnhancedReportExporter(payloads[0], None, rules=rules).export_pdf_bytes()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "repeats": repeats,
+        "reports_per_second": iterations / elapsed,
+        "mean_seconds": elapsed / iterations,
+        "phase_mean_seconds": phases,
+        "peak_memory_bytes": peak,
+        "mean_pdf_bytes": sum(sizes) / len(sizes),
+    }
+
+
+def compare(current, baseline, threshold, all_phases=False):
+    """Lista las métricas que empeoraron más que el umbral y que el ruido"""
+    regressions = []
+    for profile, result in current["profiles"].items():
+        previous = baseline.get("profiles", {}).get(profile)
+        if previous is None:
+            continue
+        # (nombre, antes, después, menor es mejor, piso de ruido absoluto)
+        checks = [
+            (
+                "mean_seconds",
+                previous["mean_seconds"],
+                result["mean_seconds"],
+                NOISE_FLOOR_SECONDS,
+            ),
+            (
+                "peak_memory_bytes",
+                previous["peak_memory_bytes"],
+                result["peak_memory_bytes"],
+                NOISE_FLOOR_BYTES,
+            ),
+        ]
+        for phase, seconds in result["phase_mean_seconds"].items():
+            if not all_phases and phase not in GATED_PHASES:
+                continue
+            if phase in previous["phase_mean_seconds"]:
+                checks.append(
+                    (
+                        f"phase.{phase}",
+                        previous["phase_mean_seconds"][phase],
+                        seconds,
+                        NOISE_FLOOR_SECONDS,
+                    )
+                )
+        for name, before, after, floor in checks:
+            if not before or after - before <= floor:
+                continue
+            change = (after - before) / before
+            if change > threshold:
+                regressions.append(
+                    f"{profile}.{name}: {before:.6g} -> {after:.6g} ({change:+.1%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES))
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="resultados JSON de referencia")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument(
+        "--all-phases",
+        action="store_true",
+        help="comparar también las fases cortas, no solo build y total",
+    )
+    args = parser.parse_args()
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "profiles": {},
+    }
+    for profile in args.profiles:
+        iterations = min(
+            args.iterations, DEFAULT_ITERATIONS.get(profile, args.iterations)
+        )
+        result = bench_profile(profile, iterations, max(1, args.repeats))
+        results["profiles"][profile] = result
+        print(
+            f"{profile:>14}: {result['reports_per_second']:8.1f} reportes/s  "
+            f"pico {result['peak_memory_bytes'] / 1024 / 1024:7.1f} MiB"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.all_phases)
+        if regressions:
+            print(f"Regresiones mayores a {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("Sin regresiones respecto de la referencia")
+
+
+if __name__ == "__main__":
+    main()
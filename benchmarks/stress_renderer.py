@@ -0,0 +1,104 @@
+"""Prueba de estrés multi-thread de ReportRenderer.
+
+Renderiza un conjunto de payloads sintéticos variados desde muchos threads
+a la vez con un único ReportRenderer compartido. Los threads arrancan en un
+proceso que todavía no renderizó nada, así que compiten por las cachés que
+se llenan en el primer uso (estilos, textos fijos, bloques del plan de
+acción). La referencia se renderiza en un solo thread en otro proceso
+nuevo. En modo determinista (sin fechas ni identificadores aleatorios en el
+PDF) cada salida debe ser idéntica byte a byte a su referencia. Termina con
+código 1 si alguna difiere o falla.
+
+Uso: python benchmarks/stress_renderer.py [--threads 8] [--rounds 5]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import hashlib
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from report_exporter import ReportRenderer
+from synthetic import generate_results
+
+# Perfiles mezclados para que los threads maqueten reportes distintos a la vez
+STRESS_PROFILES = ("tiny", "typical", "long_titles")
+
+
+def payloads(count):
+    """Payloads variados: perfiles y semillas distintos, con fecha fija"""
+    results = []
+    for index in range(count):
+        payload = generate_results(STRESS_PROFILES[index % len(STRESS_PROFILES)], index)
+        payload["analysis_date"] = "2024-01-15"
+        results.append(payload)
+    return results
+
+
+def reference_digests(count):
+    """Hashes de los payloads renderizados en un solo thread, y reportes/s"""
+    renderer = ReportRenderer(deterministic=True)
+    inputs = payloads(count)
+    start = time.perf_counter()
+    digests = [
+        hashlib.sha256(renderer.render_pdf_bytes(payload)).hexdigest()
+        for payload in inputs
+    ]
+    return digests, len(inputs) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--payloads", type=int, default=24)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    renderer = ReportRenderer(deterministic=True)
+    inputs = payloads(args.payloads)
+
+    def render(index):
+        try:
+            digest = hashlib.sha256(
+                renderer.render_pdf_bytes(inputs[index])
+            ).hexdigest()
+        except Exception as e:
+            return index, f"error: {e}"
+        return index, digest
+
+    jobs = list(range(len(inputs))) * args.rounds
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        results = list(executor.map(render, jobs))
+    threaded_rate = len(jobs) / (time.perf_counter() - start)
+
+    # La referencia va después y en otro proceso: los threads encontraron
+    # las cachés de primer uso vacías
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        expected, serial_rate = executor.submit(
+            reference_digests, args.payloads
+        ).result()
+
+    mismatches = [
+        (index, digest) for index, digest in results if digest != expected[index]
+    ]
+    print(
+        f"{len(jobs)} renders en {args.threads} threads: "
+        f"{threaded_rate:.1f} reportes/s (un thread: {serial_rate:.1f})"
+    )
+    if mismatches:
+        print(f"{len(mismatches)} salidas distintas de la referencia:")
+        for index, digest in mismatches[:10]:
+            print(f"  payload {index}: {digest}")
+        sys.exit(1)
+    print("Todas las salidas coinciden con la referencia")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Generador de analysis_results sintéticos para los benchmarks.
+
+Cada perfil describe un tamaño de payload, desde uno mínimo hasta casos
+patológicos (títulos muy largos, miles de problemas). Los problemas masivos
+se obtienen con un catálogo de reglas sintético que revisa la sección
+"synthetic" del payload. No hay perfil de muchos encabezados: el reporte
+solo muestra cuántos hay por nivel, así que su número no cambia el render.
+"""
+
+import random
+
+from report_rules import CompiledRules, ISSUE_RULES, IssueRule, equals
+
+PROFILES = {
+    "tiny": {"title_length": 10, "issues": 0, "headers": 1, "minimal": True},
+    "typical": {"title_length": 55, "issues": 0, "headers": 8, "minimal": False},
+    "long_titles": {
+        "title_length": 5000,
+        "issues": 0,
+        "headers": 8,
+        "minimal": False,
+    },
+    "many_issues": {
+        "title_length": 55,
+        "issues": 2000,
+        "headers": 8,
+        "minimal": False,
+    },
+    "pathological": {
+        "title_length": 5000,
+        "issues": 5000,
+        "headers": 8,
+        "minimal": False,
+    },
+}
+
+_WORDS = ("seo", "página", "rendimiento", "contenido", "móvil", "enlace", "título")
+
+
+def _text(rng, length):
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def generate_results(profile="typical", seed=0):
+    """Genera un analysis_results sintético según el perfil"""
+    spec = PROFILES[profile]
+    rng = random.Random(seed)
+    url = f"https://sitio-{seed}.example.com/"
+
+    if spec["minimal"]:
+        return {"url": url, "meta_data": {"title_tag": {"optimal_length": "bad"}}}
+
+    title_length = spec["title_length"]
+    headers = spec["headers"]
+    results = {
+        "url": url,
+        "technical_seo": {
+            "html_structure": {
+                "has_doctype": rng.random() > 0.3,
+                "has_head": True,
+                "has_html_tag": True,
+            },
+            "ssl_check": {"has_ssl": rng.random() > 0.2},
+            "robots_txt": {"exists": rng.random() > 0.5},
+            "sitemap": {"exists": True, "url_count": rng.randint(1, 50000)},
+        },
+        "meta_data": {
+            "title_tag": {
+                "content": _text(rng, title_length),
+                "length": title_length,
+                "optimal_length": "good" if 30 <= title_length <= 60 else "bad",
+            },
+            "meta_description": {"length": 140, "optimal_length": "good"},
+            "headers": {
+                "h1": {"count": 1},
+                "h2": {"count": headers},
+                "h3": {"count": headers * 2},
+            },
+            "img_alt": {
+                "with_alt": rng.randint(0, 200),
+                "without_alt": rng.randint(0, 20),
+            },
+        },
+        "performance": {
+            "load_time": {
+                "time_seconds": round(rng.uniform(0.3, 8.0), 2),
+                "rating": rng.choice(("good", "average", "bad")),
+            },
+            "page_size": {
+                "size_mb": round(rng.uniform(0.1, 12.0), 2),
+                "rating": rng.choice(("good", "bad")),
+            },
+            "status_code": {"code": 200},
+        },
+        "mobile": {
+            "viewport": {"is_responsive": True},
+            "responsive_design": {
+                "has_fluid_images": rng.random() > 0.4,
+                "has_media_queries": True,
+            },
+        },
+    }
+    if spec["issues"]:
+        results["synthetic"] = {
+            f"check_{index}": {"status": "bad"} for index in range(spec["issues"])
+        }
+    return results
+
+
+def synthetic_rules(count):
+    """Catálogo con las reglas reales más count reglas sobre "synthetic" """
+    rules = list(ISSUE_RULES)
+    for index in range(count):
+        rules.append(
+            IssueRule(
+                f"Chequeo sintético {index}",
+                path=("synthetic", f"check_{index}", "status"),
+                predicate=equals("bad"),
+                severity=("critical", "moderate", "minor")[index % 3],
+                current_state=f"El chequeo {index} está en estado {{status}}",
+                solution=f"Corregir el elemento revisado por el chequeo {index}",
+                steps=("Identificar el elemento", "Corregirlo", "Volver a auditar"),
+                benefit="Mejor calidad general del sitio",
+            )
+        )
+    return CompiledRules(rules)
+
+
+def rules_for_profile(profile):
+    """Catálogo que corresponde al perfil (None usa el catálogo por defecto)"""
+    issues = PROFILES[profile]["issues"]
+    return synthetic_rules(issues) if issues else None
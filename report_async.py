@@ -0,0 +1,160 @@
+"""Exportación de reportes para servicios basados en asyncio.
+
+El renderizado es CPU intensivo, así que se ejecuta en un executor y el
+event loop queda libre para atender otras peticiones. AsyncReportExporter
+limita cuántos renders corren a la vez, acota la cola de espera (aplicando
+contrapresión a quien llama) y propaga la cancelación: si la tarea que
+espera el PDF se cancela, el render pendiente no llega a ejecutarse y uno
+en curso en un executor de threads se interrumpe en el próximo flowable.
+Un render ocupa su lugar hasta que el executor lo termina, no hasta que se
+cancela la tarea que lo espera.
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import threading
+
+from report_exporter import EnhancedReportExporter
+
+
+class ReportQueueFull(Exception):
+    """La cola de renders pendientes está llena"""
+
+
+def _render_pdf_bytes(analysis_results, report_data, cancel_event=None):
+    """Renderiza un reporte en memoria dentro del executor"""
+    exporter = EnhancedReportExporter(analysis_results, report_data)
+    return exporter.export_pdf_bytes(cancel_event)
+
+
+class AsyncReportExporter:
+    """Exportador asíncrono con concurrencia y cola acotadas.
+
+    max_concurrency limita los renders simultáneos y max_queue cuántos más
+    pueden esperar turno. Con la cola llena, export_pdf_bytes espera a que
+    se libere lugar, o lanza ReportQueueFull si se llama con wait=False.
+    Sin executor se crea un ProcessPoolExecutor propio de max_concurrency
+    procesos, que close() libera: el render no compite por el GIL con el
+    event loop. En un executor de procesos solo se cancelan los renders que
+    no empezaron; uno en curso sigue ocupando su lugar hasta terminar. Con
+    threads=True el executor propio es de threads y un render cancelado se
+    interrumpe en el próximo flowable, a costa de competir con el event loop.
+    """
+
+    def __init__(
+        self, executor=None, max_concurrency=None, max_queue=None, threads=False
+    ):
+        if max_concurrency is None:
+            max_concurrency = os.cpu_count() or 1
+        if max_queue is None:
+            max_queue = max_concurrency * 4
+
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._owns_executor = executor is None
+        if executor is None and threads:
+            executor = ThreadPoolExecutor(
+                max_workers=max_concurrency, thread_name_prefix="report-render"
+            )
+        self._executor = executor or ProcessPoolExecutor(max_workers=max_concurrency)
+        # Un threading.Event no cruza a otro proceso: allí solo se cancela
+        # lo que todavía no empezó a ejecutarse
+        self._cancel_running = not isinstance(self._executor, ProcessPoolExecutor)
+
+        self._render_slots = asyncio.Semaphore(max_concurrency)
+        self._admission = asyncio.Semaphore(max_concurrency + max_queue)
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    async def export_pdf_bytes(self, analysis_results, report_data=None, wait=True):
+        """Renderiza el reporte en el executor y retorna los bytes del PDF"""
+        if not wait and self._admission.locked():
+            self.rejected += 1
+            raise ReportQueueFull("No hay lugar en la cola de renders")
+
+        try:
+            async with self._admission:
+                self.queued += 1
+                try:
+                    await self._render_slots.acquire()
+                finally:
+                    self.queued -= 1
+                return await self._run(analysis_results, report_data)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+    def _finish_render(self, loop):
+        """Libera el lugar de un render cuando el executor lo termina"""
+
+        def release():
+            self.running -= 1
+            self._render_slots.release()
+
+        def on_done(_):
+            try:
+                loop.call_soon_threadsafe(release)
+            except RuntimeError:
+                # El event loop ya se cerró: nadie más espera lugar
+                pass
+
+        return on_done
+
+    async def _run(self, analysis_results, report_data):
+        cancel_event = threading.Event() if self._cancel_running else None
+        self.running += 1
+        try:
+            future = self._executor.submit(
+                _render_pdf_bytes, analysis_results, report_data, cancel_event
+            )
+        except BaseException:
+            self.running -= 1
+            self._render_slots.release()
+            raise
+        # El lugar se libera cuando termina el trabajo del executor, aunque
+        # la espera se cancele antes: un render que no se puede interrumpir
+        # sigue ocupando su proceso
+        future.add_done_callback(self._finish_render(asyncio.get_running_loop()))
+        try:
+            pdf_bytes = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # wrap_future cancela el trabajo pendiente; el evento corta el que
+            # ya está corriendo en un thread
+            future.cancel()
+            if cancel_event is not None:
+                cancel_event.set()
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        return pdf_bytes
+
+    def stats(self):
+        """Estado de la cola y contadores de renders"""
+        return {
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+    def close(self):
+        """Libera el executor si fue creado por este exportador"""
+        if self._owns_executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
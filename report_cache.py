@@ -0,0 +1,188 @@
+"""Caché de PDFs renderizados, direccionada por contenido.
+
+La clave es un hash estable de los resultados normalizados, del análisis y
+de las opciones de renderizado, de modo que dos análisis idénticos producen
+la misma clave. Los PDFs se guardan en disco con un límite de tamaño total y
+desalojo LRU (el menos usado recientemente sale primero). Varios procesos
+pueden compartir el directorio: cada uno encuentra los PDFs que guardaron
+los demás y cuenta sus bytes en el límite al leerlos o al releer el
+directorio (ver RenderCache.put).
+
+La fecha de análisis forma parte de la clave porque se imprime en la
+portada. Si los resultados no traen analysis_date se usa la de hoy, y
+resultados idénticos solo comparten PDF el mismo día. Con stable_date esa
+fecha no entra en la clave: se reutilizan entre días, a cambio de que el PDF
+muestre la fecha del primer render. Los resultados con analysis_date
+siempre dan una clave estable.
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+# Subir este número invalida las entradas cuando cambia la maquetación
+RENDER_CACHE_VERSION = 1
+
+# Segundos entre relecturas del directorio para contar los PDFs de otros procesos
+DEFAULT_RESCAN_INTERVAL = 60
+
+
+def render_cache_key(normalized_results, analysis, options):
+    """Calcula la clave de caché de un render a partir de datos JSON"""
+    payload = {
+        "version": RENDER_CACHE_VERSION,
+        "results": normalized_results,
+        "analysis": analysis,
+        "options": options,
+    }
+    encoded = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """Almacén en disco de PDFs con tamaño acotado y desalojo LRU"""
+
+    def __init__(
+        self,
+        directory,
+        max_bytes=256 * 1024 * 1024,
+        stable_date=False,
+        rescan_interval=DEFAULT_RESCAN_INTERVAL,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Sin la fecha de hoy en la clave (ver la documentación del módulo)
+        self.stable_date = stable_date
+        # Segundos entre relecturas del directorio (ver put)
+        self.rescan_interval = rescan_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # clave -> bytes, del más antiguo al más nuevo
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._scanning = False
+        self._last_scan = 0.0
+        os.makedirs(directory, exist_ok=True)
+        self._rescan()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _scan(self):
+        """Archivos del directorio como [(clave, bytes)], del más antiguo al más nuevo.
+
+        Las fechas de los archivos son el orden LRU compartido entre los
+        procesos que usan el mismo directorio.
+        """
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pdf"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            found.append((stat.st_mtime, name[:-4], stat.st_size))
+        return [(key, size) for _, key, size in sorted(found)]
+
+    def _rescan(self):
+        """Relee el índice del directorio sin bloquear get ni put mientras tanto"""
+        with self._lock:
+            if self._scanning:
+                return
+            self._scanning = True
+        try:
+            found = self._scan()
+        except BaseException:
+            with self._lock:
+                self._scanning = False
+            raise
+        with self._lock:
+            self._scanning = False
+            self._last_scan = time.monotonic()
+            self._entries = OrderedDict(found)
+            self._total_bytes = sum(self._entries.values())
+            self._evict()
+
+    def get(self, key):
+        """Retorna el PDF guardado para la clave, o None si no está"""
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            # La fecha del archivo conserva el orden LRU entre procesos
+            os.utime(self._path(key))
+        except OSError:
+            # No existe, o otro proceso que comparte el directorio lo desalojó
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            # Un PDF que guardó otro proceso entra al índice y al límite
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self.hits += 1
+            self._evict()
+        return data
+
+    def put(self, key, data):
+        """Guarda un PDF y desaloja los menos usados si se excede el límite.
+
+        El índice en memoria solo cuenta los PDFs que este proceso guardó o
+        leyó. Si su total pasa el límite, o pasaron rescan_interval segundos
+        desde la última lectura, se relee el directorio para contar los de
+        otros procesos antes de desalojar.
+        """
+        if len(data) > self.max_bytes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            rescan = (
+                self._total_bytes > self.max_bytes
+                or time.monotonic() - self._last_scan >= self.rescan_interval
+            )
+            if not rescan:
+                self._evict()
+        if rescan:
+            self._rescan()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        """Contadores de uso de la caché"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,241 @@
+"""Reporte de rastreo de un sitio completo, con una fila por URL.
+
+Las páginas se consumen de a una desde un iterable y los flowables se
+producen con un generador: la historia nunca existe completa en memoria,
+así que el pico de memoria de los flowables no crece con la cantidad de
+URLs. Las filas se agrupan en LongTables que repiten el encabezado en cada
+página y se dividen sin problemas entre páginas.
+
+El PDF en sí lo acumula reportlab hasta guardarlo, por eso este modo
+comprime las páginas: lo que crece con el rastreo es solo la salida
+comprimida.
+"""
+
+import io
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import LongTable, Paragraph, SimpleDocTemplate, Spacer
+from reportlab.platypus import TableStyle
+
+from report_exporter import EnhancedReportExporter, _status
+from report_model import InvalidResultsError
+
+CRAWL_COLUMNS = [
+    "URL",
+    "Técnico",
+    "Meta Datos",
+    "Carga",
+    "Status",
+    "Mobile",
+    "Problemas",
+]
+CRAWL_COL_WIDTHS = [190, 55, 60, 60, 40, 50, 55]
+
+CRAWL_TABLE_STYLE_COMMANDS = [
+    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+    ("FONTSIZE", (0, 0), (-1, -1), 7),
+    ("ALIGN", (1, 0), (-1, -1), "CENTER"),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.beige]),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+    ("TOPPADDING", (0, 0), (-1, -1), 2),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+]
+
+# Caracteres de URL que entran en la columna con la fuente de la tabla
+MAX_URL_CHARS = 60
+
+_crawl_table_style = None
+
+
+def _get_crawl_table_style():
+    """Estilo de las tablas del rastreo, construido una vez por proceso"""
+    global _crawl_table_style
+    if _crawl_table_style is None:
+        _crawl_table_style = TableStyle(CRAWL_TABLE_STYLE_COMMANDS)
+    return _crawl_table_style
+
+
+class LazyStory:
+    """Lista de flowables que se llena a demanda desde un generador.
+
+    Implementa solo las operaciones que usa doc.build: mirar y quitar del
+    frente, reinsertar las partes divididas y un pequeño adelanto para los
+    flowables que deben quedar junto al siguiente.
+    """
+
+    def __init__(self, flowables, lookahead=8):
+        self._source = iter(flowables)
+        self._buffer = []
+        self._lookahead = lookahead
+
+    def _fill(self, count):
+        while len(self._buffer) < count:
+            try:
+                self._buffer.append(next(self._source))
+            except StopIteration:
+                return
+
+    def __len__(self):
+        self._fill(self._lookahead)
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop if index.stop is not None else self._lookahead)
+        elif index >= 0:
+            self._fill(index + 1)
+        return self._buffer[index]
+
+    def __setitem__(self, index, value):
+        self._buffer[index] = value
+
+    def __delitem__(self, index):
+        del self._buffer[index]
+
+    def insert(self, index, flowable):
+        self._buffer.insert(index, flowable)
+
+
+class CrawlReportExporter:
+    """Exporta el reporte de rastreo de muchas URLs con memoria acotada"""
+
+    def __init__(self, pages, site_url=None, rows_per_table=500, rules=None):
+        self.pages = pages
+        self.site_url = site_url
+        self.rows_per_table = rows_per_table
+        self._page_exporter = EnhancedReportExporter({}, None, rules=rules)
+        self.custom_styles = self._page_exporter.custom_styles
+        self.totals = self._initialize_totals()
+
+    def _initialize_totals(self):
+        return {
+            "pages": 0,
+            "invalid_pages": 0,
+            "pages_with_issues": 0,
+            "critical_issues": 0,
+            "moderate_issues": 0,
+            "minor_issues": 0,
+        }
+
+    def export_pdf(self, filename):
+        """Exporta el reporte de rastreo a un archivo PDF"""
+        self._build_pdf(filename)
+        return filename
+
+    def export_to(self, stream):
+        """Escribe el reporte de rastreo en un flujo binario"""
+        self._build_pdf(stream)
+        return stream
+
+    def export_pdf_bytes(self):
+        """Genera el reporte de rastreo en memoria y retorna su contenido"""
+        buffer = io.BytesIO()
+        self._build_pdf(buffer)
+        return buffer.getvalue()
+
+    def _build_pdf(self, target):
+        self.totals = self._initialize_totals()
+        doc = SimpleDocTemplate(target, pagesize=letter, pageCompression=1)
+        doc.build(LazyStory(self._iter_story()))
+
+    def _iter_story(self):
+        """Genera los flowables del reporte a medida que se leen las páginas"""
+        yield Paragraph("Reporte de Rastreo SEO", self.custom_styles["Title"])
+        if self.site_url:
+            yield Paragraph(
+                f"Sitio Analizado: {self.site_url}", self.custom_styles["Subtitle"]
+            )
+        yield Paragraph(
+            f"Fecha de Análisis: {datetime.now().strftime('%d/%m/%Y')}",
+            self.custom_styles["Normal"],
+        )
+        yield Spacer(1, 20)
+        yield Paragraph("Hallazgos por URL", self.custom_styles["Heading2"])
+
+        rows = []
+        for page in self.pages:
+            rows.append(self._crawl_row(page))
+            if len(rows) == self.rows_per_table:
+                yield self._crawl_table(rows)
+                rows = []
+        if rows or not self.totals["pages"]:
+            yield self._crawl_table(rows)
+
+        # Los totales solo se conocen al terminar de leer las páginas
+        yield Spacer(1, 20)
+        yield from self._create_totals_section()
+
+    def _crawl_table(self, rows):
+        return LongTable(
+            [CRAWL_COLUMNS] + rows,
+            colWidths=CRAWL_COL_WIDTHS,
+            repeatRows=1,
+            style=_get_crawl_table_style(),
+        )
+
+    def _crawl_row(self, page):
+        """Resume los hallazgos de una URL en una fila de la tabla"""
+        self.totals["pages"] += 1
+        exporter = self._page_exporter
+        exporter._load(page, None)
+
+        url = page.get("url") if isinstance(page, dict) else None
+        url = _shorten(str(url) if url else "No disponible")
+        try:
+            exporter.model
+        except InvalidResultsError:
+            self.totals["invalid_pages"] += 1
+            return [url, "Datos inválidos", "", "", "", "", ""]
+
+        exporter._analyze_issues()
+        summary = exporter.summary_data
+        for counter in ("critical_issues", "moderate_issues", "minor_issues"):
+            self.totals[counter] += summary[counter]
+        if summary["total_issues"]:
+            self.totals["pages_with_issues"] += 1
+
+        # Las mismas filas que la sección de métricas del reporte individual
+        performance = exporter._get_performance_rows()
+        return [
+            url,
+            _group_status(exporter._get_technical_rows()),
+            _group_status(exporter._get_meta_rows()),
+            performance[1][1],
+            performance[3][1],
+            _group_status(exporter._get_mobile_rows()),
+            str(summary["total_issues"]),
+        ]
+
+    def _create_totals_section(self):
+        totals = self.totals
+        yield Paragraph("Resumen del Rastreo", self.custom_styles["Heading2"])
+        yield LongTable(
+            [
+                ["Métrica", "Valor"],
+                ["Páginas analizadas", str(totals["pages"])],
+                ["Páginas con problemas", str(totals["pages_with_issues"])],
+                ["Páginas con datos inválidos", str(totals["invalid_pages"])],
+                ["Problemas Críticos", str(totals["critical_issues"])],
+                ["Problemas Moderados", str(totals["moderate_issues"])],
+                ["Problemas Menores", str(totals["minor_issues"])],
+            ],
+            colWidths=[200, 300],
+            style=self._page_exporter._get_table_style(),
+        )
+
+
+def _group_status(rows):
+    """OK si todas las métricas de la tabla lo están, si no cuántas fallan"""
+    failing = sum(1 for row in rows[1:] if row[1] == _status(False))
+    return "OK" if not failing else f"{failing} a mejorar"
+
+
+def _shorten(url):
+    if len(url) <= MAX_URL_CHARS:
+        return url
+    return url[: MAX_URL_CHARS - 1] + "…"
@@ -1,29 +1,401 @@
 import sys
-import reportlab
 import io
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Paragraph,
-    Table,
-    Spacer,
-    Image,
-    TableStyle,
-)
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import os
+import threading
+import time
+import weakref
+
+from report_cache import render_cache_key
+from report_history import FIELD_LABELS, TRACKED_FIELDS, diff_snapshots
+from report_model import InvalidResultsError, build_report_model, read_analysis_date
+from report_rules import DEFAULT_RULES, SEVERITIES
+from report_storage import ReportStorage
+
+REPORTS_DIR = "/home/Felipeeee/reports"
+FALLBACK_REPORTS_DIR = "/tmp"
+
+# Secciones del reporte en orden: (nombre, método, espacio posterior, traza)
+REPORT_SECTIONS = (
+    ("cover", "_create_cover_page", 30, "Portada creada"),
+    ("plan_title", "_create_plan_title", 30, None),
+    ("executive_summary", "_create_executive_summary", 20, "Resumen ejecutivo creado"),
+    ("changes", "_create_changes_section", 20, "Sección de cambios creada"),
+    ("detailed_metrics", "_create_detailed_metrics", 20, "Métricas detalladas creadas"),
+    ("strengths", "_create_strengths_section", 20, "Sección de fortalezas creada"),
+    ("action_plan", "_create_detailed_action_plan", 20, "Plan de acción creado"),
+    ("next_steps", "_create_next_steps", 0, "Próximos pasos creados"),
+    ("appendix", "_create_appendix", 0, "Anexo creado"),
+)
+
+# Variantes del reporte que se venden: título del plan en la portada y
+# secciones que incluye cada una. "basic" es el reporte de siempre; "full"
+# es el plan completo, que agrega un anexo con todos los datos analizados, y
+# "executive" un PDF corto para la dirección.
+_BASIC_SECTIONS = (
+    "cover",
+    "plan_title",
+    "executive_summary",
+    "changes",
+    "detailed_metrics",
+    "strengths",
+    "action_plan",
+    "next_steps",
+)
+REPORT_VARIANTS = {
+    "basic": {
+        "title": "Plan Básico - Análisis SEO",
+        "sections": _BASIC_SECTIONS,
+    },
+    "full": {
+        "title": "Plan Completo - Análisis SEO",
+        "sections": _BASIC_SECTIONS + ("appendix",),
+    },
+    "executive": {
+        "title": "Resumen Ejecutivo - Análisis SEO",
+        "sections": (
+            "cover",
+            "plan_title",
+            "executive_summary",
+            "changes",
+            "next_steps",
+        ),
+    },
+}
+
+
+# Perfiles de salida: opciones de SimpleDocTemplate y si se agregan metadatos.
+# "draft" prioriza la velocidad (sin compresión de páginas ni metadatos) para
+# vistas previas; "archival" prioriza el tamaño y describe el documento para
+# su almacenamiento. "default" conserva la salida de siempre.
+RENDER_PROFILES = {
+    "default": {"doc_options": {}, "metadata": False},
+    "draft": {"doc_options": {"pageCompression": 0}, "metadata": False},
+    "archival": {"doc_options": {"pageCompression": 1}, "metadata": True},
+}
+
+
+# Los colores van por nombre: reportlab los resuelve al maquetar, así que
+# definir la tabla no obliga a importar reportlab.lib.colors
+TABLE_STYLE_COMMANDS = [
+    ("BACKGROUND", (0, 0), (-1, 0), "grey"),
+    ("TEXTCOLOR", (0, 0), (-1, 0), "whitesmoke"),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, 0), 14),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+    ("BACKGROUND", (0, 1), (-1, -1), "beige"),
+    ("TEXTCOLOR", (0, 1), (-1, -1), "black"),
+    ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+    ("FONTSIZE", (0, 1), (-1, -1), 12),
+    ("GRID", (0, 0), (-1, -1), 1, "black"),
+]
+
+
+# reportlab se importa recién al armar el primer PDF: quien solo analiza
+# resultados (summary_data, ReportRenderer.analyze) no paga su carga. Cada
+# método que crea flowables llama a _ensure_reportlab antes de usarlos.
+_reportlab_loaded = False
+
+
+def _ensure_reportlab():
+    """Importa reportlab y publica sus nombres en el módulo, una sola vez"""
+    global _reportlab_loaded
+    global SimpleDocTemplate, Paragraph, Table, Spacer, Image, TableStyle
+    global inch, colors, letter, getSampleStyleSheet, ParagraphStyle
+    if _reportlab_loaded:
+        return
+    from reportlab.platypus import (
+        SimpleDocTemplate,
+        Paragraph,
+        Table,
+        Spacer,
+        Image,
+        TableStyle,
+    )
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    _reportlab_loaded = True
+
+
+def _reportlab_version():
+    """Versión de reportlab, sin importar sus módulos de maquetación"""
+    from reportlab import Version
+
+    return Version
+
+
+def _create_custom_styles(styles):
+    """Crea estilos personalizados para el PDF"""
+    return {
+        "Title": ParagraphStyle(
+            "CustomTitle",
+            parent=styles["Heading1"],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=1,
+        ),
+        "Subtitle": ParagraphStyle(
+            "CustomSubtitle",
+            parent=styles["Heading2"],
+            fontSize=18,
+            spaceAfter=20,
+            alignment=1,
+        ),
+        "Heading2": ParagraphStyle(
+            "CustomHeading2",
+            parent=styles["Heading2"],
+            fontSize=16,
+            spaceAfter=12,
+            spaceBefore=24,
+        ),
+        "Heading3": ParagraphStyle(
+            "CustomHeading3",
+            parent=styles["Heading3"],
+            fontSize=14,
+            spaceAfter=10,
+            spaceBefore=20,
+        ),
+        "Normal": ParagraphStyle(
+            "CustomNormal", parent=styles["Normal"], fontSize=12, spaceAfter=12
+        ),
+        "List": ParagraphStyle(
+            "CustomList",
+            parent=styles["Normal"],
+            fontSize=12,
+            leftIndent=20,
+            spaceAfter=10,
+        ),
+    }
+
+
+def _value_or(value, default):
+    """Retorna el valor del modelo o el valor por defecto si está ausente"""
+    return default if value is None else value
+
+
+def _status(ok):
+    """Etiqueta de estado usada en las tablas de métricas"""
+    return "OK" if ok else "Necesita Mejoras"
+
+
+def _change_value(value):
+    """Valor de un campo en la tabla de cambios"""
+    if value is None:
+        return "No disponible"
+    if isinstance(value, bool):
+        return "Sí" if value else "No"
+    return str(value)
+
+
+def _write_pdf(target, pdf_bytes):
+    """Escribe un PDF ya renderizado en un nombre de archivo o en un flujo"""
+    if hasattr(target, "write"):
+        target.write(pdf_bytes)
+    else:
+        with open(target, "wb") as f:
+            f.write(pdf_bytes)
+
+
+def _stream_offset(target):
+    """Posición actual de un flujo, o None si no se puede consultar.
+
+    Pipes y sockets tienen tell() pero lanzan OSError al llamarlo.
+    """
+    try:
+        if target.seekable():
+            return target.tell()
+    except (AttributeError, OSError, ValueError):
+        pass
+    return None
+
+
+# Protege la creación y las escrituras de los estados compartidos del proceso
+# (registro de estilos y cachés de textos fijos). Las lecturas no lo toman:
+# lo compartido no se modifica una vez publicado.
+_shared_state_lock = threading.Lock()
+
+# Registro de estilos compartido por todos los exportadores del proceso. Se
+# construye una sola vez y se trata como de solo lectura: ningún exportador
+# debe modificar los estilos que obtiene de aquí.
+_style_registry = None
+
+
+def _get_style_registry():
+    """Retorna la hoja de estilos y los estilos de tabla del proceso"""
+    global _style_registry
+    if _style_registry is None:
+        _ensure_reportlab()
+        with _shared_state_lock:
+            if _style_registry is None:
+                styles = getSampleStyleSheet()
+                _style_registry = {
+                    "styles": styles,
+                    "custom_styles": _create_custom_styles(styles),
+                    "table_style": TableStyle(TABLE_STYLE_COMMANDS),
+                }
+    return _style_registry
+
+
+# Almacén por defecto de export_pdf, creado al primer uso
+_default_storage = None
+
+
+def _get_default_storage():
+    """Almacén plano en REPORTS_DIR, o en el directorio alternativo"""
+    global _default_storage
+    if _default_storage is None:
+        try:
+            _default_storage = ReportStorage(REPORTS_DIR, layout="flat")
+        except Exception:
+            _default_storage = ReportStorage(FALLBACK_REPORTS_DIR, layout="flat")
+    return _default_storage
+
+
+# Estado del sistema verificado por _check_system_status o warm_up
+_system_status = None
+
+
+def _probe_system_status():
+    """Verifica el directorio de reportes y recolecta datos del entorno"""
+    import reportlab
+
+    status = {
+        "reports_dir": REPORTS_DIR,
+        "dir_exists": False,
+        "dir_writable": False,
+        "python_version": sys.version,
+        "reportlab_version": reportlab.__version__,
+        "user": os.getenv("USER"),
+        "current_dir": os.getcwd(),
+    }
+
+    try:
+        os.makedirs(status["reports_dir"], exist_ok=True)
+        status["dir_exists"] = os.path.exists(status["reports_dir"])
+        status["dir_writable"] = os.access(status["reports_dir"], os.W_OK)
+    except Exception as e:
+        status["error"] = str(e)
+
+    return status
+
+
+class RenderCancelled(Exception):
+    """El renderizado se canceló a pedido de quien lo solicitó"""
+
+
+def _check_cancelled(cancel_event):
+    """Interrumpe el renderizado si se pidió cancelarlo"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise RenderCancelled("Renderizado cancelado")
+
+
+# Markup ya analizado de textos fijos, por (texto, estilo). Paragraph no se
+# puede compartir entre documentos porque guarda su estado de maquetación,
+# pero sí sus fragmentos: crear un Paragraph con frags evita volver a parsear.
+_parsed_static_texts = {}
+
+# Bloques fijos del plan de acción por regla del catálogo. Las claves son
+# débiles: los bloques de un catálogo descartado (por ejemplo uno recibido
+# de otro proceso para un solo render) se liberan con él.
+_action_plan_blocks = weakref.WeakKeyDictionary()
+
+
+def _parse_paragraph(text, style):
+    """Markup analizado de un texto: (texto, estilo, fragmentos)"""
+    paragraph = Paragraph(text, style)
+    return paragraph.text, paragraph.style, paragraph.frags
+
+
+def _parse_static_text(text, style):
+    """Analiza una sola vez el markup de un texto fijo"""
+    key = (text, style.name)
+    parsed = _parsed_static_texts.get(key)
+    if parsed is None:
+        parsed = _parse_paragraph(text, style)
+        with _shared_state_lock:
+            parsed = _parsed_static_texts.setdefault(key, parsed)
+    return parsed
+
+
+def _static_paragraph(text, style):
+    """Crea un Paragraph de texto fijo sin volver a analizar su markup"""
+    text, style, frags = _parse_static_text(text, style)
+    return Paragraph(text, style, frags=frags)
 
 
 class EnhancedReportExporter:
-    def __init__(self, analysis_results, report_data):
+    def __init__(
+        self,
+        analysis_results,
+        report_data,
+        rules=None,
+        render_cache=None,
+        metrics=None,
+        verbose=False,
+        profile="default",
+        history=None,
+        storage=None,
+        deterministic=False,
+        variant="basic",
+    ):
+        if profile not in RENDER_PROFILES:
+            raise ValueError(f"Perfil de salida desconocido: {profile}")
+        if variant not in REPORT_VARIANTS:
+            raise ValueError(f"Variante de reporte desconocida: {variant}")
+        # Catálogo compilado de reglas (compile una sola vez con CompiledRules)
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        # Caché opcional de PDFs renderizados (report_cache.RenderCache)
+        self.render_cache = render_cache
+        # Destino de tiempos y contadores (report_metrics.MetricsSink)
+        self.metrics = metrics
+        # Trazas de progreso por stdout, desactivadas por defecto
+        self.verbose = verbose
+        # Perfil de salida (ver RENDER_PROFILES)
+        self.profile = profile
+        # Historial de análisis para la sección de cambios (SnapshotStore)
+        self.history = history
+        # Almacén de los PDFs de export_pdf (report_storage.ReportStorage)
+        self.storage = storage
+        # Salida byte a byte reproducible (ver content_hash)
+        self.deterministic = deterministic
+        # Variante del reporte (ver REPORT_VARIANTS)
+        self.variant = variant
+        self._load(analysis_results, report_data)
+
+    def _load(self, analysis_results, report_data):
+        """Carga los resultados a exportar reutilizando los estilos ya creados"""
         self.results = analysis_results
         self.report = report_data
-        self.styles = getSampleStyleSheet()
-        self.custom_styles = self._create_custom_styles()
         self.summary_data = self._initialize_summary_data()
+        self._model = None
+        self._analysis_date = None
+        self._dated_results = False
+        self._changes = None
+        # Datos comunes a las variantes de export_variants_bytes, o None
+        self._shared = None
+
+    @property
+    def styles(self):
+        """Hoja de estilos del proceso; importa reportlab en el primer uso"""
+        return _get_style_registry()["styles"]
+
+    @property
+    def custom_styles(self):
+        """Estilos personalizados del proceso; importa reportlab en el primer uso"""
+        return _get_style_registry()["custom_styles"]
+
+    @property
+    def model(self):
+        """Modelo tipado de los resultados, construido una vez por resultado"""
+        if self._model is None:
+            self._model = build_report_model(self.results)
+        return self._model
 
     def _initialize_summary_data(self):
         """Inicializa la estructura de datos del resumen"""
@@ -36,49 +408,6 @@ class EnhancedReportExporter:
             "overall_status": "No analizado",
         }
 
-    def _create_custom_styles(self):
-        """Crea estilos personalizados para el PDF"""
-        return {
-            "Title": ParagraphStyle(
-                "CustomTitle",
-                parent=self.styles["Heading1"],
-                fontSize=24,
-                spaceAfter=30,
-                alignment=1,
-            ),
-            "Subtitle": ParagraphStyle(
-                "CustomSubtitle",
-                parent=self.styles["Heading2"],
-                fontSize=18,
-                spaceAfter=20,
-                alignment=1,
-            ),
-            "Heading2": ParagraphStyle(
-                "CustomHeading2",
-                parent=self.styles["Heading2"],
-                fontSize=16,
-                spaceAfter=12,
-                spaceBefore=24,
-            ),
-            "Heading3": ParagraphStyle(
-                "CustomHeading3",
-                parent=self.styles["Heading3"],
-                fontSize=14,
-                spaceAfter=10,
-                spaceBefore=20,
-            ),
-            "Normal": ParagraphStyle(
-                "CustomNormal", parent=self.styles["Normal"], fontSize=12, spaceAfter=12
-            ),
-            "List": ParagraphStyle(
-                "CustomList",
-                parent=self.styles["Normal"],
-                fontSize=12,
-                leftIndent=20,
-                spaceAfter=10,
-            ),
-        }
-
     def _analyze_issues(self):
         """Analiza los problemas del sitio y actualiza summary_data"""
         if not isinstance(self.results, dict):
@@ -87,42 +416,13 @@ class EnhancedReportExporter:
 
         self.summary_data = self._initialize_summary_data()
 
-        # Analizar problemas técnicos
-        tech_seo = self.results.get("technical_seo", {})
-        if tech_seo:
-            html_structure = tech_seo.get("html_structure", {})
-            if html_structure and not html_structure.get("has_doctype", False):
-                self.summary_data["moderate_issues"] += 1
-                self.summary_data["priority_improvements"].append(
-                    {"issue": "Falta declaración DOCTYPE", "priority": "media"}
-                )
-
-        # Analizar meta datos
-        meta_data = self.results.get("meta_data", {})
-        if meta_data:
-            title_tag = meta_data.get("title_tag", {})
-            if title_tag and title_tag.get("optimal_length") == "bad":
-                self.summary_data["critical_issues"] += 1
-                self.summary_data["priority_improvements"].append(
-                    {"issue": "Título no optimizado", "priority": "alta"}
-                )
-
-            img_alt = meta_data.get("img_alt", {})
-            if img_alt and img_alt.get("without_alt", 0) > 0:
-                self.summary_data["minor_issues"] += 1
-                self.summary_data["priority_improvements"].append(
-                    {"issue": "Imágenes sin texto alternativo", "priority": "baja"}
-                )
-
-        # Analizar mobile
-        mobile = self.results.get("mobile", {})
-        if mobile:
-            responsive = mobile.get("responsive_design", {})
-            if responsive and not responsive.get("has_fluid_images", False):
-                self.summary_data["critical_issues"] += 1
-                self.summary_data["priority_improvements"].append(
-                    {"issue": "Diseño no responsive", "priority": "alta"}
-                )
+        # Una sola pasada del catálogo compilado sobre los resultados
+        for rule in self.rules.evaluate(self.results):
+            counter, priority = SEVERITIES[rule.severity]
+            self.summary_data[counter] += 1
+            self.summary_data["priority_improvements"].append(
+                {"issue": rule.issue, "priority": priority}
+            )
 
         self._update_summary_status()
 
@@ -144,148 +444,406 @@ class EnhancedReportExporter:
             )
         )
 
-    def _check_system_status(self):
-        """Verifica el estado del sistema y los permisos"""
+    def _check_system_status(self, refresh=False):
+        """Verifica el estado del sistema y los permisos.
 
-    status = {
-        "reports_dir": "/home/Felipeeee/reports",
-        "dir_exists": False,
-        "dir_writable": False,
-        "python_version": sys.version,
-        "reportlab_version": reportlab.__version__,
-        "user": os.getenv("USER"),
-        "current_dir": os.getcwd(),
-    }
-
-    try:
-        os.makedirs(status["reports_dir"], exist_ok=True)
-        status["dir_exists"] = os.path.exists(status["reports_dir"])
-        status["dir_writable"] = os.access(status["reports_dir"], os.W_OK)
-    except Exception as e:
-        status["error"] = str(e)
-
-    return status
+        El resultado se calcula una vez por proceso; refresh=True lo repite.
+        """
+        global _system_status
+        if _system_status is None or refresh:
+            _system_status = _probe_system_status()
+        return dict(_system_status)
 
     def export_pdf(self, filename=None):
         """Exporta el reporte mejorado a PDF"""
 
-    try:
-        # Asegurar que el directorio existe
-        reports_dir = "/home/Felipeeee/reports"
         try:
-            os.makedirs(reports_dir, exist_ok=True)
-            print(f"Directorio creado/verificado: {reports_dir}")
-        except Exception as dir_error:
-            print(f"Error al crear directorio: {str(dir_error)}")
-            reports_dir = "/tmp"  # Directorio alternativo
-            print(f"Usando directorio alternativo: {reports_dir}")
-
-        if filename is None:
-            filename = os.path.join(
-                reports_dir,
-                f"seo_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-            )
-
-        print(f"Generando PDF en: {filename}")
-
+            storage = self.storage or _get_default_storage()
+            if filename is None and self.deterministic:
+                # El nombre sale del contenido: el mismo PDF, el mismo archivo
+                pdf_bytes = self.export_pdf_bytes()
+                token = hashlib.sha256(pdf_bytes).hexdigest()
+                filename = storage.write(pdf_bytes, token=token)
+                self._log(f"PDF generado exitosamente en: {filename}")
+                return filename
+            if filename is None:
+                filename = storage.new_path()
+
+            # Se escribe en un temporal y se renombra: nunca queda visible un
+            # PDF a medio escribir
+            self._log(f"Generando PDF en: {filename}")
+            with storage.open(filename) as f:
+                self._build_pdf(f)
+
+            # Verificar que el archivo se creó
+            if not os.path.exists(filename):
+                raise Exception("El archivo PDF no se generó correctamente")
+
+            self._log(f"PDF generado exitosamente en: {filename}")
+            return filename
+
+        except Exception as e:
+            self._log(f"Error al generar PDF: {str(e)}")
+            self._log(f"Tipo de error: {type(e)}")
+            self._log(f"Detalles adicionales: {getattr(e, '__dict__', {})}")
+            raise Exception(f"Error al generar PDF: {str(e)}")
+
+    def export_to(self, stream, cancel_event=None):
+        """Escribe el reporte PDF en un flujo binario provisto por quien llama.
+
+        Si se pasa cancel_event (threading.Event) y se activa durante el
+        renderizado, se interrumpe con RenderCancelled.
+        """
+        try:
+            self._build_pdf(stream, cancel_event)
+            return stream
+        except RenderCancelled:
+            raise
+        except Exception as e:
+            self._log(f"Error al generar PDF: {str(e)}")
+            raise Exception(f"Error al generar PDF: {str(e)}")
+
+    def export_pdf_bytes(self, cancel_event=None):
+        """Genera el reporte PDF en memoria y retorna su contenido"""
+        buffer = io.BytesIO()
+        self.export_to(buffer, cancel_event)
+        return buffer.getvalue()
+
+    def export_variants_bytes(self, variants=None, cancel_event=None):
+        """Genera varias variantes del reporte con un solo análisis.
+
+        Retorna {variante: bytes del PDF}, por defecto de todas las de
+        REPORT_VARIANTS. Los resultados se analizan una vez y las filas y
+        textos que comparten las variantes se calculan una vez (ver
+        _shared_value); cada variante arma sus propios flowables con ellos.
+        """
+        variants = list(variants or REPORT_VARIANTS)
+        for variant in variants:
+            if variant not in REPORT_VARIANTS:
+                raise ValueError(f"Variante de reporte desconocida: {variant}")
+
+        original = self.variant
+        outputs = {}
+        self._shared = {}
+        try:
+            self._prepare()
+            for variant in variants:
+                start = time.perf_counter()
+                self.variant = variant
+                buffer = io.BytesIO()
+                self._layout(buffer, cancel_event)
+                outputs[variant] = buffer.getvalue()
+                self._record_timing("total", time.perf_counter() - start)
+                self._increment("reports_rendered")
+        except RenderCancelled:
+            self._increment("reports_cancelled")
+            raise
+        except Exception as e:
+            self._increment("reports_failed")
+            self._log(f"Error al generar PDF: {str(e)}")
+            raise Exception(f"Error al generar PDF: {str(e)}")
+        finally:
+            self.variant = original
+            self._shared = None
+        return outputs
+
+    def _log(self, message):
+        """Traza de progreso, solo si el exportador es verbose"""
+        if self.verbose:
+            print(message)
+
+    def _record_timing(self, name, seconds):
+        if self.metrics is not None:
+            self.metrics.timing(name, seconds)
+
+    def _record_value(self, name, value):
+        if self.metrics is not None:
+            self.metrics.observe(name, value)
+
+    def _increment(self, name):
+        if self.metrics is not None:
+            self.metrics.increment(name)
+
+    def _build_pdf(self, target, cancel_event=None):
+        """Construye el PDF en un nombre de archivo o en un flujo binario"""
+        start = time.perf_counter()
+        try:
+            self._render(target, cancel_event)
+        except RenderCancelled:
+            self._increment("reports_cancelled")
+            raise
+        except Exception:
+            self._increment("reports_failed")
+            raise
+        self._record_timing("total", time.perf_counter() - start)
+        self._increment("reports_rendered")
+
+    def _prepare(self):
+        """Analiza los resultados y guarda su instantánea antes de un render"""
+        self._analyze()
+        if self._tracks_history():
+            self._save_snapshot()
+
+    def _analyze(self):
+        """Valida y analiza los resultados y fija la fecha del reporte.
+
+        No escribe nada: los cambios se calculan contra la última instantánea
+        sin guardar una nueva, así que puede repetirse (por ejemplo para un
+        ETag) sin alterar el historial.
+        """
         # Verificar que self.results existe
         if not self.results:
             raise Exception("No hay resultados para generar el reporte")
 
-        # Analizar issues
+        # Validar, normalizar y analizar antes de cualquier trabajo de maquetación
+        start = time.perf_counter()
+        self._model = build_report_model(self.results)
+        previous = self._previous_snapshot()
+        # Evaluar el catálogo es más barato que comparar contra la instantánea
+        # anterior, así que el análisis se repite siempre
         self._analyze_issues()
-        print("Análisis completado")
+        self._record_timing("analysis", time.perf_counter() - start)
+        self._log("Análisis completado")
+
+        if previous is not None:
+            current = {"results": self.model.to_dict(), "summary": self.summary_data}
+            self._changes = diff_snapshots(previous, current)
+
+        # La fecha de la portada se fija una vez para que forme parte de la
+        # clave de caché: resultados idénticos del mismo día comparten PDF.
+        # Si los resultados traen analysis_date, esa es la fecha del reporte
+        analysis_date = read_analysis_date(self.results)
+        self._dated_results = analysis_date is not None
+        if analysis_date is None:
+            if self.deterministic:
+                raise InvalidResultsError(
+                    "El modo determinista requiere analysis_date en los resultados"
+                )
+            analysis_date = datetime.now()
+        self._analysis_date = analysis_date.strftime("%d/%m/%Y")
+
+    def _render(self, target, cancel_event):
+        """Analiza los resultados, arma la historia y la maqueta en target"""
+        self._prepare()
+        self._layout(target, cancel_event)
+
+    def _layout(self, target, cancel_event):
+        """Arma la historia de los resultados ya analizados y la maqueta en target"""
+        cache_key = None
+        if self.render_cache is not None:
+            cache_key = self._render_cache_key()
+            cached = self.render_cache.get(cache_key)
+            if cached is not None:
+                self._log("PDF obtenido de la caché")
+                self._increment("render_cache_hits")
+                _write_pdf(target, cached)
+                self._record_value("pdf_bytes", len(cached))
+                return
+            output, target = target, io.BytesIO()
+
+        _check_cancelled(cancel_event)
 
         # Crear el PDF
-        doc = SimpleDocTemplate(filename, pagesize=letter)
-        story = []
-        print("Iniciando generación de contenido")
+        _ensure_reportlab()
+        doc = SimpleDocTemplate(target, pagesize=letter, **self._doc_options())
+        if cancel_event is not None:
+            # Punto de cancelación después de maquetar cada flowable
+            doc.afterFlowable = lambda flowable: _check_cancelled(cancel_event)
+        self._log("Iniciando generación de contenido")
 
         # Agregar secciones con verificación
         try:
-            story.extend(self._create_cover_page())
-            story.append(Spacer(1, 30))
-            print("Portada creada")
-
-            story.append(
-                Paragraph("Plan Básico - Análisis SEO", self.custom_styles["Subtitle"])
-            )
-            story.append(Spacer(1, 30))
-
-            story.extend(self._create_executive_summary())
-            story.append(Spacer(1, 20))
-            print("Resumen ejecutivo creado")
-
-            story.extend(self._create_detailed_metrics())
-            story.append(Spacer(1, 20))
-            print("Métricas detalladas creadas")
-
-            story.extend(self._create_strengths_section())
-            story.append(Spacer(1, 20))
-            print("Sección de fortalezas creada")
-
-            story.extend(self._create_detailed_action_plan())
-            story.append(Spacer(1, 20))
-            print("Plan de acción creado")
-
-            story.extend(self._create_next_steps())
-            print("Próximos pasos creados")
-
+            story = self._build_story(cancel_event)
         except Exception as section_error:
-            print(f"Error al crear sección: {str(section_error)}")
+            self._log(f"Error al crear sección: {str(section_error)}")
             raise
 
         # Construir el PDF
-        print("Iniciando construcción del PDF")
+        self._log("Iniciando construcción del PDF")
+        start_offset = None
+        if hasattr(target, "write"):
+            start_offset = _stream_offset(target)
         try:
+            start = time.perf_counter()
             doc.build(story)
-            print("PDF construido exitosamente")
+            self._record_timing("build", time.perf_counter() - start)
+            self._log("PDF construido exitosamente")
         except Exception as build_error:
-            print(f"Error al construir PDF: {str(build_error)}")
+            self._log(f"Error al construir PDF: {str(build_error)}")
             raise
 
-        # Verificar que el archivo se creó
-        if not os.path.exists(filename):
-            raise Exception("El archivo PDF no se generó correctamente")
+        self._record_value("pdf_pages", doc.page)
+        if cache_key is not None:
+            pdf_bytes = target.getvalue()
+            self.render_cache.put(cache_key, pdf_bytes)
+            _write_pdf(output, pdf_bytes)
+            self._record_value("pdf_bytes", len(pdf_bytes))
+        elif hasattr(target, "write"):
+            # En un flujo sin posición (pipe, socket) no se mide el tamaño
+            end_offset = _stream_offset(target)
+            if start_offset is not None and end_offset is not None:
+                self._record_value("pdf_bytes", end_offset - start_offset)
+        else:
+            self._record_value("pdf_bytes", os.path.getsize(target))
+
+    def _tracks_history(self):
+        """Si los análisis de este sitio se guardan en el historial"""
+        return self.history is not None and bool(self.model.url)
+
+    def _previous_snapshot(self):
+        """Última instantánea del sitio en el historial, si la hay"""
+        if not self._tracks_history():
+            return None
+        return self.history.latest(self.model.url)
+
+    def _save_snapshot(self):
+        """Guarda el análisis actual como la última instantánea del sitio"""
+        self.history.save(
+            self.model.url,
+            self.model.to_dict(),
+            self.summary_data,
+        )
 
-        print(f"PDF generado exitosamente en: {filename}")
-        return filename
+    def _doc_options(self):
+        """Opciones de SimpleDocTemplate según el perfil de salida"""
+        profile = RENDER_PROFILES[self.profile]
+        options = dict(profile["doc_options"])
+        if self.deterministic:
+            # Fecha de creación e identificador fijos en lugar de la hora y
+            # un valor aleatorio
+            options["invariant"] = 1
+        if profile["metadata"]:
+            url = _value_or(self.model.url, "No disponible")
+            options.update(
+                title=f"Reporte de Análisis SEO - {url}",
+                subject=REPORT_VARIANTS[self.variant]["title"],
+                creator="EnhancedReportExporter",
+                keywords=["SEO", url],
+            )
+        return options
 
-    except Exception as e:
-        print(f"Error al generar PDF: {str(e)}")
-        print(f"Tipo de error: {type(e)}")
-        print(f"Detalles adicionales: {getattr(e, '__dict__', {})}")
-        raise Exception(f"Error al generar PDF: {str(e)}")
+    def _build_story(self, cancel_event=None):
+        """Arma la lista de flowables de las secciones, midiendo cada una"""
+        sections = REPORT_VARIANTS[self.variant]["sections"]
+        story = []
+        for name, method, space_after, message in REPORT_SECTIONS:
+            if name not in sections:
+                continue
+            _check_cancelled(cancel_event)
+            start = time.perf_counter()
+            elements = getattr(self, method)()
+            story.extend(elements)
+            # Las secciones opcionales sin contenido no dejan espacio
+            if space_after and elements:
+                story.append(Spacer(1, space_after))
+            self._record_timing(f"section.{name}", time.perf_counter() - start)
+            if message:
+                self._log(message)
+        return story
+
+    def _render_cache_key(self):
+        """Clave de caché del reporte: resultados normalizados, análisis y opciones"""
+        analysis = dict(self.summary_data)
+        analysis["states"] = [
+            self._get_current_state(issue)
+            for issue in self.summary_data["priority_improvements"]
+        ]
+        if self._changes is not None:
+            analysis["changes"] = self._changes
+        options = {
+            "profile": self.profile,
+            "variant": self.variant,
+            # Catálogos con los mismos problemas pero otros textos dan otro PDF
+            "catalog": self.rules.fingerprint,
+            # Otra versión de reportlab puede maquetar otros bytes
+            "reportlab": _reportlab_version(),
+        }
+        if self._dated_results or not (
+            self.render_cache is not None and self.render_cache.stable_date
+        ):
+            # La fecha de hoy queda fuera con stable_date (ver report_cache)
+            options["analysis_date"] = self._analysis_date
+        if self.deterministic:
+            options["deterministic"] = True
+        return render_cache_key(self.model.to_dict(), analysis, options)
+
+    def content_hash(self):
+        """Hash del PDF determinista de los resultados, sin maquetarlo.
+
+        Resultados, catálogo (incluidos sus textos), perfil, variante y
+        versión de reportlab idénticos dan el mismo hash y el mismo PDF byte
+        a byte, así que sirve como ETag. Analiza los resultados sin
+        guardar instantáneas: solo un render las guarda.
+        """
+        if not self.deterministic:
+            raise Exception("content_hash requiere el modo determinista")
+        self._analyze()
+        return self._render_cache_key()
+
+    def _shared_value(self, key, compute):
+        """Dato de una sección, calculado una sola vez por export_variants_bytes"""
+        if self._shared is None:
+            return compute()
+        if key not in self._shared:
+            self._shared[key] = compute()
+        return self._shared[key]
+
+    def _paragraph(self, text, style):
+        """Paragraph cuyo markup se analiza una sola vez por export_variants_bytes"""
+        if self._shared is None:
+            return Paragraph(text, style)
+        text, style, frags = self._shared_value(
+            ("paragraph", text, style.name),
+            lambda: _parse_paragraph(text, style),
+        )
+        return Paragraph(text, style, frags=frags)
 
     def _create_cover_page(self):
         """Crea la portada del reporte"""
+        _ensure_reportlab()
         elements = []
         elements.append(
             Paragraph("Reporte de Análisis SEO", self.custom_styles["Title"])
         )
         elements.append(Spacer(1, 30))
 
-        url = self.results.get("url", "No disponible")
+        url = _value_or(self.model.url, "No disponible")
         elements.append(
-            Paragraph(f"URL Analizada: {url}", self.custom_styles["Subtitle"])
+            self._paragraph(f"URL Analizada: {url}", self.custom_styles["Subtitle"])
         )
+        analysis_date = self._analysis_date or datetime.now().strftime("%d/%m/%Y")
         elements.append(
-            Paragraph(
-                f"Fecha de Análisis: {datetime.now().strftime('%d/%m/%Y')}",
+            self._paragraph(
+                f"Fecha de Análisis: {analysis_date}",
                 self.custom_styles["Normal"],
             )
         )
         return elements
 
+    def _create_plan_title(self):
+        """Crea el título del plan contratado"""
+        _ensure_reportlab()
+        title = REPORT_VARIANTS[self.variant]["title"]
+        return [_static_paragraph(title, self.custom_styles["Subtitle"])]
+
     def _create_executive_summary(self):
         """Crea el resumen ejecutivo"""
+        _ensure_reportlab()
         elements = []
         elements.append(Paragraph("Resumen Ejecutivo", self.custom_styles["Heading2"]))
 
+        rows = self._shared_value("summary_rows", self._get_summary_rows)
+        table = Table(rows, colWidths=[200, 300])
+        table.setStyle(self._get_table_style())
+        elements.append(table)
+        return elements
+
+    def _get_summary_rows(self):
+        """Filas de la tabla del resumen ejecutivo"""
         if not hasattr(self, "summary_data") or not self.summary_data:
             self._analyze_issues()
 
-        data = [
+        return [
             ["Métrica", "Valor"],
             ["Estado General", self.summary_data.get("overall_status", "No analizado")],
             ["Problemas Críticos", str(self.summary_data.get("critical_issues", 0))],
@@ -294,218 +852,198 @@ class EnhancedReportExporter:
             ["Total de Problemas", str(self.summary_data.get("total_issues", 0))],
         ]
 
-        table = Table(data, colWidths=[200, 300])
+    def _create_changes_section(self):
+        """Crea la sección de cambios desde el análisis anterior del sitio"""
+        _ensure_reportlab()
+        changes = self._changes
+        if changes is None:
+            return []
+
+        since = datetime.fromisoformat(changes["since"]).strftime("%d/%m/%Y")
+        elements = [
+            Paragraph(f"Cambios desde el {since}", self.custom_styles["Heading2"])
+        ]
+        if not changes["tracked"] and not changes["fields"]:
+            elements.append(
+                Paragraph(
+                    "Sin cambios en los resultados desde el análisis anterior",
+                    self.custom_styles["Normal"],
+                )
+            )
+            return elements
+
+        rows = self._shared_value("changes_rows", self._get_changes_rows)
+        table = Table(rows, colWidths=[250, 125, 125])
         table.setStyle(self._get_table_style())
         elements.append(table)
+
+        for title, issues in (
+            ("Problemas nuevos", changes["new_issues"]),
+            ("Problemas resueltos", changes["resolved_issues"]),
+        ):
+            if issues:
+                elements.append(Paragraph(title, self.custom_styles["Heading3"]))
+                for issue in issues:
+                    elements.append(
+                        self._paragraph(f"• {issue}", self.custom_styles["List"])
+                    )
         return elements
 
+    def _get_changes_rows(self):
+        """Filas de la tabla de cambios desde el análisis anterior"""
+        changes = self._changes
+        before, after = changes["total_issues"]
+        data = [
+            ["Cambio", "Antes", "Ahora"],
+            ["Problemas Totales", str(before), str(after)],
+        ]
+        for path, (before, after) in changes["tracked"].items():
+            data.append(
+                [TRACKED_FIELDS[path], _change_value(before), _change_value(after)]
+            )
+        for path, (before, after) in changes["fields"].items():
+            label = FIELD_LABELS.get(path)
+            if label is not None:
+                data.append([label, _change_value(before), _change_value(after)])
+        return data
+
     def _get_table_style(self):
         """Retorna el estilo básico para tablas"""
-        return TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 14),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                ("TEXTCOLOR", (0, 1), (-1, -1), colors.black),
-                ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 1), (-1, -1), 12),
-                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-            ]
-        )
+        return _get_style_registry()["table_style"]
 
     def _create_detailed_metrics(self):
         """Crea sección detallada de métricas"""
+        _ensure_reportlab()
         elements = []
         elements.append(
             Paragraph("Análisis Detallado de Métricas", self.custom_styles["Heading2"])
         )
 
-        # 1. Análisis Técnico SEO
-        elements.append(
-            Paragraph("1. Análisis Técnico SEO", self.custom_styles["Heading3"])
-        )
-        tech_data = [
+        tables = self._shared_value("metric_tables", self._get_metric_tables)
+        for index, (title, rows, col_widths) in enumerate(tables):
+            elements.append(Paragraph(title, self.custom_styles["Heading3"]))
+            elements.append(
+                Table(rows, colWidths=col_widths, style=self._get_table_style())
+            )
+            if index < len(tables) - 1:
+                elements.append(Spacer(1, 15))
+        return elements
+
+    def _get_metric_tables(self):
+        """Contenido de las tablas de métricas: (título, filas, anchos)"""
+        return [
+            ("1. Análisis Técnico SEO", self._get_technical_rows(), [150, 100, 250]),
+            ("2. Meta Datos", self._get_meta_rows(), [150, 100, 250]),
+            ("3. Performance", self._get_performance_rows(), [150, 150, 100]),
+            ("4. Mobile", self._get_mobile_rows(), [150, 100, 250]),
+        ]
+
+    def _get_technical_rows(self):
+        """Filas de la tabla de análisis técnico SEO"""
+        tech = self.model.technical_seo
+        return [
             ["Métrica", "Estado", "Detalles"],
             [
                 "Estructura HTML",
-                (
-                    "OK"
-                    if self.results.get("technical_seo", {})
-                    .get("html_structure", {})
-                    .get("has_html_tag")
-                    else "Necesita Mejoras"
-                ),
+                _status(tech.html_structure.has_html_tag),
                 self._get_html_structure_details(),
             ],
-            [
-                "SSL/HTTPS",
-                (
-                    "OK"
-                    if self.results.get("technical_seo", {})
-                    .get("ssl_check", {})
-                    .get("has_ssl")
-                    else "Necesita Mejoras"
-                ),
-                self._get_ssl_details(),
-            ],
+            ["SSL/HTTPS", _status(tech.ssl_check.has_ssl), self._get_ssl_details()],
             [
                 "Robots.txt",
-                (
-                    "OK"
-                    if self.results.get("technical_seo", {})
-                    .get("robots_txt", {})
-                    .get("exists")
-                    else "Necesita Mejoras"
-                ),
+                _status(tech.robots_txt.exists),
                 self._get_robots_details(),
             ],
-            [
-                "Sitemap",
-                (
-                    "OK"
-                    if self.results.get("technical_seo", {})
-                    .get("sitemap", {})
-                    .get("exists")
-                    else "Necesita Mejoras"
-                ),
-                self._get_sitemap_details(),
-            ],
+            ["Sitemap", _status(tech.sitemap.exists), self._get_sitemap_details()],
         ]
-        elements.append(
-            Table(tech_data, colWidths=[150, 100, 250], style=self._get_table_style())
-        )
-        elements.append(Spacer(1, 15))
 
-        # 2. Meta Datos
-        elements.append(Paragraph("2. Meta Datos", self.custom_styles["Heading3"]))
-        meta = self.results.get("meta_data", {})
-        meta_data = [
+    def _get_meta_rows(self):
+        """Filas de la tabla de meta datos"""
+        meta = self.model.meta_data
+        title, img_alt = meta.title_tag, meta.img_alt
+        return [
             ["Elemento", "Estado", "Contenido/Detalles"],
             [
                 "Title Tag",
-                (
-                    "OK"
-                    if meta.get("title_tag", {}).get("optimal_length") == "good"
-                    else "Necesita Mejoras"
-                ),
-                f"Actual: {meta.get('title_tag', {}).get('content', 'No disponible')} ({meta.get('title_tag', {}).get('length', 0)} caracteres)",
+                _status(title.optimal_length == "good"),
+                f"Actual: {_value_or(title.content, 'No disponible')} ({_value_or(title.length, 0)} caracteres)",
             ],
             [
                 "Meta Description",
-                (
-                    "OK"
-                    if meta.get("meta_description", {}).get("optimal_length") == "good"
-                    else "Necesita Mejoras"
-                ),
-                f"Longitud: {meta.get('meta_description', {}).get('length', 0)} caracteres",
+                _status(meta.meta_description.optimal_length == "good"),
+                f"Longitud: {_value_or(meta.meta_description.length, 0)} caracteres",
             ],
             [
                 "Headers",
-                (
-                    "OK"
-                    if meta.get("headers", {}).get("h1", {}).get("count") == 1
-                    else "Necesita Mejoras"
-                ),
+                _status(meta.headers.h1 == 1),
                 self._get_headers_details(),
             ],
             [
                 "Alt Text",
-                (
-                    "OK"
-                    if meta.get("img_alt", {}).get("without_alt", 1) == 0
-                    else "Necesita Mejoras"
-                ),
-                f"{meta.get('img_alt', {}).get('with_alt', 0)} imágenes con alt, {meta.get('img_alt', {}).get('without_alt', 0)} sin alt",
+                _status(img_alt.without_alt == 0),
+                f"{_value_or(img_alt.with_alt, 0)} imágenes con alt, {_value_or(img_alt.without_alt, 0)} sin alt",
             ],
         ]
-        elements.append(
-            Table(meta_data, colWidths=[150, 100, 250], style=self._get_table_style())
-        )
-        elements.append(Spacer(1, 15))
 
-        # 3. Performance
-        elements.append(Paragraph("3. Performance", self.custom_styles["Heading3"]))
-        perf = self.results.get("performance", {})
-        perf_data = [
+    def _get_performance_rows(self):
+        """Filas de la tabla de performance"""
+        perf = self.model.performance
+        return [
             ["Métrica", "Valor", "Estado"],
             [
                 "Tiempo de Carga",
-                f"{perf.get('load_time', {}).get('time_seconds', 0)} segundos",
-                perf.get("load_time", {}).get("rating", "N/A"),
+                f"{_value_or(perf.load_time.time_seconds, 0)} segundos",
+                _value_or(perf.load_time.rating, "N/A"),
             ],
             [
                 "Tamaño de Página",
-                f"{perf.get('page_size', {}).get('size_mb', 0)} MB",
-                perf.get("page_size", {}).get("rating", "N/A"),
+                f"{_value_or(perf.page_size.size_mb, 0)} MB",
+                _value_or(perf.page_size.rating, "N/A"),
             ],
             [
                 "Status Code",
-                str(perf.get("status_code", {}).get("code", 0)),
-                "OK" if perf.get("status_code", {}).get("code") == 200 else "Revisar",
+                str(_value_or(perf.status_code.code, 0)),
+                "OK" if perf.status_code.code == 200 else "Revisar",
             ],
         ]
-        elements.append(
-            Table(perf_data, colWidths=[150, 150, 100], style=self._get_table_style())
-        )
-        elements.append(Spacer(1, 15))
 
-        # 4. Mobile
-        elements.append(Paragraph("4. Mobile", self.custom_styles["Heading3"]))
-        mobile = self.results.get("mobile", {})
-        mobile_data = [
+    def _get_mobile_rows(self):
+        """Filas de la tabla de mobile"""
+        mobile = self.model.mobile
+        return [
             ["Elemento", "Estado", "Detalles"],
             [
                 "Viewport",
-                (
-                    "OK"
-                    if mobile.get("viewport", {}).get("is_responsive")
-                    else "Necesita Mejoras"
-                ),
+                _status(mobile.viewport.is_responsive),
                 self._get_viewport_details(),
             ],
             [
                 "Responsive Design",
-                (
-                    "OK"
-                    if mobile.get("responsive_design", {}).get("has_fluid_images")
-                    else "Necesita Mejoras"
-                ),
+                _status(mobile.responsive_design.has_fluid_images),
                 self._get_responsive_details(),
             ],
         ]
-        elements.append(
-            Table(mobile_data, colWidths=[150, 100, 250], style=self._get_table_style())
-        )
-        return elements
 
     def _get_html_structure_details(self):
         """Obtiene detalles de la estructura HTML"""
-        structure = self.results.get("technical_seo", {}).get("html_structure", {})
-        return f"{'Tiene' if structure.get('has_doctype') else 'Falta'} DOCTYPE, {'Tiene' if structure.get('has_head') else 'Falta'} HEAD"
+        structure = self.model.technical_seo.html_structure
+        return f"{'Tiene' if structure.has_doctype else 'Falta'} DOCTYPE, {'Tiene' if structure.has_head else 'Falta'} HEAD"
 
     def _get_ssl_details(self):
         """Obtiene detalles del SSL"""
-        ssl = self.results.get("technical_seo", {}).get("ssl_check", {})
-        return f"Certificado {'válido' if ssl.get('has_ssl') else 'no encontrado'}"
+        ssl = self.model.technical_seo.ssl_check
+        return f"Certificado {'válido' if ssl.has_ssl else 'no encontrado'}"
 
     def _get_robots_details(self):
         """Obtiene detalles del robots.txt"""
-        robots = self.results.get("technical_seo", {}).get("robots_txt", {})
-        return (
-            f"{'Archivo presente' if robots.get('exists') else 'Archivo no encontrado'}"
-        )
+        robots = self.model.technical_seo.robots_txt
+        return f"{'Archivo presente' if robots.exists else 'Archivo no encontrado'}"
 
     def _get_sitemap_details(self):
         """Obtiene detalles del sitemap"""
-        sitemap = self.results.get("technical_seo", {}).get("sitemap")
-        if sitemap is None:
-            return "No encontrado"
-        if isinstance(sitemap, dict) and sitemap.get("exists"):
-            return f"Presente con {sitemap.get('url_count', 0)} URLs"
+        sitemap = self.model.technical_seo.sitemap
+        if sitemap.exists:
+            return f"Presente con {_value_or(sitemap.url_count, 0)} URLs"
         return "No encontrado"
 
     def _get_current_state(self, issue):
@@ -516,44 +1054,31 @@ class EnhancedReportExporter:
         if not isinstance(self.results, dict):
             return "No hay datos disponibles"
 
-        meta_data = self.results.get("meta_data", {})
-        tech_seo = self.results.get("technical_seo", {})
-        mobile = self.results.get("mobile", {})
-
-        states = {
-            "Título no optimizado": lambda: f"Título actual tiene {meta_data.get('title_tag', {}).get('length', 0)} caracteres",
-            "Diseño no responsive": lambda: "Faltan elementos responsive en la página",
-            "Falta declaración DOCTYPE": lambda: "Página sin declaración DOCTYPE",
-            "Imágenes sin texto alternativo": lambda: f"{meta_data.get('img_alt', {}).get('without_alt', 0)} imágenes sin alt text",
-        }
-
-        state_func = states.get(issue.get("issue"))
-        if state_func:
-            try:
-                return state_func()
-            except Exception:
-                return "Estado no disponible"
-        return "Estado no especificado"
+        rule = self.rules.by_issue.get(issue.get("issue"))
+        if rule is None or rule.current_state is None:
+            return "Estado no especificado"
+        try:
+            return self.rules.current_state(rule, self.results)
+        except Exception:
+            return "Estado no disponible"
 
     def _get_headers_details(self):
         """Obtiene detalles de los headers"""
-        headers = self.results.get("meta_data", {}).get("headers", {})
-        h1_count = headers.get("h1", {}).get("count", 0)
-        h2_count = headers.get("h2", {}).get("count", 0)
-        h3_count = headers.get("h3", {}).get("count", 0)
+        headers = self.model.meta_data.headers
+        h1_count = _value_or(headers.h1, 0)
+        h2_count = _value_or(headers.h2, 0)
+        h3_count = _value_or(headers.h3, 0)
         return f"H1: {h1_count}, H2: {h2_count}, H3: {h3_count}"
 
     def _get_viewport_details(self):
         """Obtiene detalles del viewport"""
-        viewport = self.results.get("mobile", {}).get("viewport", {})
-        if viewport and viewport.get("is_responsive"):
+        if self.model.mobile.viewport.is_responsive:
             return "Configurado correctamente"
         return "Necesita configuración"
 
     def _get_responsive_details(self):
         """Obtiene detalles del diseño responsive"""
-        responsive = self.results.get("mobile", {}).get("responsive_design", {})
-        if responsive and responsive.get("has_media_queries"):
+        if self.model.mobile.responsive_design.has_media_queries:
             return "Diseño responsive implementado"
         return "Falta implementación responsive"
 
@@ -562,77 +1087,45 @@ class EnhancedReportExporter:
         if not isinstance(issue, dict) or "issue" not in issue:
             return "Solución no especificada"
 
-        solutions = {
-            "Título no optimizado": "Ajustar el título a una longitud entre 30-60 caracteres",
-            "Diseño no responsive": "Implementar media queries y hacer las imágenes fluidas",
-            "Falta declaración DOCTYPE": "Agregar <!DOCTYPE html> al inicio del documento",
-            "Imágenes sin texto alternativo": "Agregar atributos alt descriptivos a las imágenes",
-            "Meta descripción no optimizada": "Ajustar la meta descripción a una longitud entre 120-155 caracteres",
-        }
-        return solutions.get(issue["issue"], "Solución no especificada")
+        rule = self.rules.by_issue.get(issue["issue"])
+        if rule is None or not rule.solution:
+            return "Solución no especificada"
+        return rule.solution
 
     def _get_implementation_steps(self, issue):
         """Obtiene los pasos de implementación según el problema"""
         if not isinstance(issue, dict) or "issue" not in issue:
             return ["Implementación no especificada"]
 
-        steps = {
-            "Título no optimizado": [
-                "Revisar el título actual",
-                "Incluir palabras clave principales",
-                "Ajustar longitud entre 30-60 caracteres",
-                "Verificar relevancia para la página",
-            ],
-            "Diseño no responsive": [
-                "Implementar meta viewport",
-                "Agregar media queries",
-                "Hacer las imágenes fluidas",
-                "Probar en diferentes dispositivos",
-            ],
-            "Falta declaración DOCTYPE": [
-                "Agregar <!DOCTYPE html> al inicio del documento",
-                "Verificar la estructura HTML",
-                "Validar el código HTML",
-            ],
-            "Imágenes sin texto alternativo": [
-                "Identificar imágenes sin alt",
-                "Agregar descripciones relevantes",
-                "Verificar la accesibilidad",
-            ],
-            "Meta descripción no optimizada": [
-                "Revisar la meta descripción actual",
-                "Incluir llamada a la acción clara",
-                "Ajustar longitud entre 120-155 caracteres",
-                "Verificar relevancia y atractivo",
-            ],
-        }
-        return steps.get(issue["issue"], ["Implementación no especificada"])
+        rule = self.rules.by_issue.get(issue["issue"])
+        if rule is None or not rule.steps:
+            return ["Implementación no especificada"]
+        return list(rule.steps)
 
     def _get_expected_benefit(self, issue):
         """Obtiene el beneficio esperado de la implementación"""
         if not isinstance(issue, dict) or "issue" not in issue:
             return "Beneficio no especificado"
 
-        benefits = {
-            "Título no optimizado": "Mejor posicionamiento en búsquedas y mayor CTR",
-            "Diseño no responsive": "Mejor experiencia en móviles y mejor ranking mobile",
-            "Falta declaración DOCTYPE": "Mejor renderizado y compatibilidad cross-browser",
-            "Imágenes sin texto alternativo": "Mejor accesibilidad y SEO para imágenes",
-            "Meta descripción no optimizada": "Mayor visibilidad en resultados de búsqueda y CTR mejorado",
-        }
-        return benefits.get(issue["issue"], "Beneficio no especificado")
+        rule = self.rules.by_issue.get(issue["issue"])
+        if rule is None or not rule.benefit:
+            return "Beneficio no especificado"
+        return rule.benefit
 
     def _create_strengths_section(self):
         """Crea la sección de fortalezas"""
+        _ensure_reportlab()
         elements = []
         elements.append(
             Paragraph("Fortalezas del Sitio", self.custom_styles["Heading2"])
         )
 
-        strengths = self._identify_strengths()
+        strengths = self._shared_value("strengths", self._identify_strengths)
         if strengths:
             for strength in strengths:
-                elements.append(Paragraph(f"• {strength}", self.custom_styles["List"]))
+                elements.append(
+                    self._paragraph(f"• {strength}", self.custom_styles["List"])
+                )
         else:
             elements.append(
                 Paragraph(
@@ -651,42 +1144,35 @@ class EnhancedReportExporter:
             return strengths
 
         # Verificar rendimiento
-        perf = self.results.get("performance", {})
-        load_time = perf.get("load_time", {})
-        if load_time and load_time.get("rating") == "good":
+        perf = self.model.performance
+        if perf.load_time.rating == "good":
             strengths.append(
-                f"Excelente tiempo de carga: {load_time.get('time_seconds')} segundos"
+                f"Excelente tiempo de carga: {perf.load_time.time_seconds} segundos"
             )
 
-        page_size = perf.get("page_size", {})
-        if page_size and page_size.get("rating") == "good":
-            strengths.append(
-                f"Tamaño de página optimizado: {page_size.get('size_mb')}MB"
-            )
+        if perf.page_size.rating == "good":
+            strengths.append(f"Tamaño de página optimizado: {perf.page_size.size_mb}MB")
 
         # Verificar SSL
-        tech_seo = self.results.get("technical_seo", {})
-        ssl_check = tech_seo.get("ssl_check", {})
-        if ssl_check and ssl_check.get("has_ssl"):
+        if self.model.technical_seo.ssl_check.has_ssl:
             strengths.append("Certificado SSL correctamente implementado")
 
         # Verificar meta datos
-        meta = self.results.get("meta_data", {})
-        meta_desc = meta.get("meta_description", {})
-        if meta_desc and meta_desc.get("optimal_length") == "good":
+        meta = self.model.meta_data
+        if meta.meta_description.optimal_length == "good":
             strengths.append("Meta descripción bien optimizada")
 
         # Verificar imágenes
-        img_alt = meta.get("img_alt", {})
-        if img_alt and img_alt.get("with_alt", 0) > 0:
+        if _value_or(meta.img_alt.with_alt, 0) > 0:
             strengths.append(
-                f"{img_alt.get('with_alt')} imágenes correctamente etiquetadas"
+                f"{meta.img_alt.with_alt} imágenes correctamente etiquetadas"
             )
 
         return strengths
 
     def _create_detailed_action_plan(self):
         """Crea plan de acción detallado"""
+        _ensure_reportlab()
         elements = []
         elements.append(
             Paragraph("Plan de Acción Detallado", self.custom_styles["Heading2"])
@@ -706,7 +1192,14 @@ class EnhancedReportExporter:
             )
             return elements
 
-        for issue in priority_improvements:
+        elements.extend(self._create_action_plan_items(priority_improvements))
+        return elements
+
+    def _create_action_plan_items(self, improvements):
+        """Crea los bloques del plan de acción de los problemas indicados"""
+        _ensure_reportlab()
+        elements = []
+        for issue in improvements:
             if not isinstance(issue, dict):
                 continue
 
@@ -714,53 +1207,72 @@ class EnhancedReportExporter:
             priority = issue.get("priority", "no especificada")
 
             elements.append(
-                Paragraph(
+                _static_paragraph(
                     f"{issue_title} (Prioridad: {priority})",
                     self.custom_styles["Heading3"],
                 )
             )
 
-            current_state = self._get_current_state(issue)
+            # Solo el estado actual depende del reporte; se arma cada vez
+            current_state = self._shared_value(
+                ("current_state", issue.get("issue")),
+                lambda: self._get_current_state(issue),
+            )
             if current_state:
                 elements.append(
-                    Paragraph("• Estado Actual:", self.custom_styles["List"])
+                    _static_paragraph("• Estado Actual:", self.custom_styles["List"])
                 )
                 elements.append(
-                    Paragraph(f"  {current_state}", self.custom_styles["Normal"])
+                    self._paragraph(f"  {current_state}", self.custom_styles["Normal"])
                 )
 
-            solution = self._get_technical_solution(issue)
-            if solution:
-                elements.append(
-                    Paragraph("• Solución Recomendada:", self.custom_styles["List"])
-                )
-                elements.append(
-                    Paragraph(f"  {solution}", self.custom_styles["Normal"])
-                )
-
-            steps = self._get_implementation_steps(issue)
-            if steps:
-                elements.append(
-                    Paragraph("• Pasos para Implementar:", self.custom_styles["List"])
-                )
-                for step in steps:
-                    elements.append(
-                        Paragraph(f"  - {step}", self.custom_styles["Normal"])
-                    )
-
-            benefit = self._get_expected_benefit(issue)
-            if benefit:
-                elements.append(
-                    Paragraph("• Beneficio Esperado:", self.custom_styles["List"])
-                )
-                elements.append(Paragraph(f"  {benefit}", self.custom_styles["Normal"]))
+            elements.extend(
+                Paragraph(text, style, frags=frags)
+                for text, style, frags in self._get_action_plan_block(issue)
+            )
 
             elements.append(Spacer(1, 10))
 
         return elements
 
+    def _get_action_plan_block(self, issue):
+        """Textos ya analizados de solución, pasos y beneficio de un problema.
+
+        El bloque de cada tipo de problema del catálogo se prepara una sola
+        vez por proceso; los reportes solo crean Paragraphs a partir de él.
+        """
+        rule = self.rules.by_issue.get(issue.get("issue"))
+        block = _action_plan_blocks.get(rule) if rule is not None else None
+        if block is not None:
+            return block
+
+        lines = []
+        solution = self._get_technical_solution(issue)
+        if solution:
+            lines.append(("• Solución Recomendada:", "List"))
+            lines.append((f"  {solution}", "Normal"))
+
+        steps = self._get_implementation_steps(issue)
+        if steps:
+            lines.append(("• Pasos para Implementar:", "List"))
+            lines.extend((f"  - {step}", "Normal") for step in steps)
+
+        benefit = self._get_expected_benefit(issue)
+        if benefit:
+            lines.append(("• Beneficio Esperado:", "List"))
+            lines.append((f"  {benefit}", "Normal"))
+
+        block = tuple(
+            _parse_static_text(text, self.custom_styles[style]) for text, style in lines
+        )
+        if rule is not None:
+            with _shared_state_lock:
+                block = _action_plan_blocks.setdefault(rule, block)
+        return block
+
     def _create_next_steps(self):
         """Crea la sección de próximos pasos"""
+        _ensure_reportlab()
         elements = []
         elements.append(
             Paragraph("Próximos Pasos Recomendados", self.custom_styles["Heading2"])
@@ -780,40 +1292,279 @@ class EnhancedReportExporter:
             )
             return elements
 
-        quick_wins = [
-            issue
-            for issue in priority_improvements
-            if isinstance(issue, dict) and issue.get("priority") == "alta"
-        ]
-        if quick_wins:
-            elements.append(
-                Paragraph(
-                    "Acciones Inmediatas (Quick Wins):", self.custom_styles["Heading3"]
-                )
-            )
-            for win in quick_wins:
+        groups = self._shared_value(
+            "next_steps_groups",
+            lambda: self._get_next_steps_groups(priority_improvements),
+        )
+        for title, issues in groups:
+            elements.append(Paragraph(title, self.custom_styles["Heading3"]))
+            for issue in issues:
                 elements.append(
-                    Paragraph(
-                        f"• {win.get('issue', 'No especificado')}",
-                        self.custom_styles["List"],
-                    )
+                    self._paragraph(f"• {issue}", self.custom_styles["List"])
                 )
 
-        medium_priority = [
-            issue
-            for issue in priority_improvements
-            if isinstance(issue, dict) and issue.get("priority") == "media"
-        ]
-        if medium_priority:
-            elements.append(
-                Paragraph("Plan a Mediano Plazo:", self.custom_styles["Heading3"])
-            )
-            for issue in medium_priority:
-                elements.append(
-                    Paragraph(
-                        f"• {issue.get('issue', 'No especificado')}",
-                        self.custom_styles["List"],
-                    )
-                )
+        return elements
 
+    def _get_next_steps_groups(self, priority_improvements):
+        """Grupos no vacíos de próximos pasos: (título, problemas)"""
+        groups = []
+        for title, priority in (
+            ("Acciones Inmediatas (Quick Wins):", "alta"),
+            ("Plan a Mediano Plazo:", "media"),
+        ):
+            issues = [
+                issue.get("issue", "No especificado")
+                for issue in priority_improvements
+                if isinstance(issue, dict) and issue.get("priority") == priority
+            ]
+            if issues:
+                groups.append((title, issues))
+        return groups
+
+    def _create_appendix(self):
+        """Crea el anexo con todos los datos analizados"""
+        _ensure_reportlab()
+        elements = [Spacer(1, 20)]
+        elements.append(
+            Paragraph("Anexo: Datos del Análisis", self.custom_styles["Heading2"])
+        )
+        rows = self._shared_value("appendix_rows", self._get_appendix_rows)
+        elements.append(
+            Table(rows, colWidths=[250, 250], style=self._get_table_style())
+        )
         return elements
+
+    def _get_appendix_rows(self):
+        """Filas del anexo: cada campo del modelo con su valor"""
+        values = self.model.to_dict()
+        data = [["Campo", "Valor"]]
+        for path, label in (*TRACKED_FIELDS.items(), *FIELD_LABELS.items()):
+            value = values
+            for key in path.split("."):
+                value = value.get(key) if isinstance(value, dict) else None
+            data.append([label, _change_value(value)])
+        return data
+
+
+class ReportRenderer:
+    """Renderizador reentrante: un objeto sirve a muchos threads a la vez.
+
+    Solo guarda configuración de solo lectura (catálogo de reglas, caché,
+    métricas, perfil, almacén, modo determinista y variante); los estilos
+    son los del registro del proceso. Cada llamada recibe sus resultados y
+    los procesa en un EnhancedReportExporter propio, así que ningún estado
+    de un render queda a la vista de otro.
+    """
+
+    def __init__(
+        self,
+        rules=None,
+        render_cache=None,
+        metrics=None,
+        profile="default",
+        storage=None,
+        deterministic=False,
+        variant="basic",
+    ):
+        if profile not in RENDER_PROFILES:
+            raise ValueError(f"Perfil de salida desconocido: {profile}")
+        if variant not in REPORT_VARIANTS:
+            raise ValueError(f"Variante de reporte desconocida: {variant}")
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.render_cache = render_cache
+        self.metrics = metrics
+        self.profile = profile
+        self.storage = storage
+        self.deterministic = deterministic
+        self.variant = variant
+
+    def _exporter(self, analysis_results, report_data):
+        return EnhancedReportExporter(
+            analysis_results,
+            report_data,
+            rules=self.rules,
+            render_cache=self.render_cache,
+            metrics=self.metrics,
+            profile=self.profile,
+            storage=self.storage,
+            deterministic=self.deterministic,
+            variant=self.variant,
+        )
+
+    def analyze(self, analysis_results):
+        """Valida y analiza los resultados y retorna su summary_data"""
+        exporter = self._exporter(analysis_results, None)
+        exporter._analyze()
+        return exporter.summary_data
+
+    def content_hash(self, analysis_results, report_data=None):
+        """Hash del PDF determinista de los resultados, para usar como ETag"""
+        return self._exporter(analysis_results, report_data).content_hash()
+
+    def render_to(self, stream, analysis_results, report_data=None, cancel_event=None):
+        """Escribe el reporte PDF en un flujo binario"""
+        return self._exporter(analysis_results, report_data).export_to(
+            stream, cancel_event
+        )
+
+    def render_pdf_bytes(self, analysis_results, report_data=None, cancel_event=None):
+        """Genera el reporte PDF en memoria y retorna su contenido"""
+        return self._exporter(analysis_results, report_data).export_pdf_bytes(
+            cancel_event
+        )
+
+    def render_variants_bytes(
+        self, analysis_results, variants=None, report_data=None, cancel_event=None
+    ):
+        """Genera varias variantes del reporte con un solo análisis"""
+        return self._exporter(analysis_results, report_data).export_variants_bytes(
+            variants, cancel_event
+        )
+
+    def render_pdf(self, analysis_results, report_data=None, filename=None):
+        """Exporta el reporte a un archivo PDF y retorna su nombre"""
+        return self._exporter(analysis_results, report_data).export_pdf(filename)
+
+
+# Resultados de ejemplo del render de calentamiento: detectan todos los
+# problemas del catálogo para que se analicen todos los textos fijos
+_WARM_UP_RESULTS = {
+    "url": "https://example.com/",
+    "technical_seo": {
+        "html_structure": {"has_doctype": False, "has_head": True},
+        "ssl_check": {"has_ssl": True},
+        "robots_txt": {"exists": True},
+        "sitemap": {"exists": True, "url_count": 10},
+    },
+    "meta_data": {
+        "title_tag": {"content": "Ejemplo", "length": 7, "optimal_length": "bad"},
+        "meta_description": {"length": 140, "optimal_length": "good"},
+        "headers": {"h1": {"count": 1}, "h2": {"count": 2}, "h3": {"count": 3}},
+        "img_alt": {"with_alt": 3, "without_alt": 1},
+    },
+    "performance": {
+        "load_time": {"time_seconds": 1.0, "rating": "good"},
+        "page_size": {"size_mb": 1.0, "rating": "good"},
+        "status_code": {"code": 200},
+    },
+    "mobile": {
+        "viewport": {"is_responsive": True},
+        "responsive_design": {"has_fluid_images": False},
+    },
+}
+
+
+def warm_up(check_reports_dir=True):
+    """Prepara el proceso para que el primer reporte real no pague el arranque.
+
+    Construye el registro de estilos, verifica una vez el directorio de
+    reportes (el resultado queda en caché para _check_system_status) y
+    renderiza en memoria un reporte descartable, lo que carga las métricas
+    de las fuentes, los módulos de salida de reportlab y el markup ya
+    analizado de los textos fijos. Un servidor pre-fork puede llamarla antes
+    de crear sus procesos para que todos compartan ese estado. Retorna el
+    estado del sistema con la duración del calentamiento.
+    """
+    global _system_status
+    start = time.perf_counter()
+    _get_style_registry()
+    status = {}
+    if check_reports_dir:
+        _system_status = _probe_system_status()
+        _get_default_storage()
+        status = dict(_system_status)
+    EnhancedReportExporter(_WARM_UP_RESULTS, None).export_pdf_bytes()
+    status["warm_up_seconds"] = time.perf_counter() - start
+    return status
+
+
+# Exportador propio de cada proceso de trabajo de export_many
+_batch_exporter = None
+
+
+def _init_batch_worker():
+    """Crea el exportador (y sus estilos) una sola vez por proceso"""
+    global _batch_exporter
+    _batch_exporter = EnhancedReportExporter({}, None)
+
+
+def _export_batch_item(task):
+    """Genera el reporte de un sitio sin propagar sus errores al lote"""
+    index, analysis_results, report_data, filename, storage = task
+    if _batch_exporter is None:
+        _init_batch_worker()
+    _batch_exporter.storage = storage
+
+    url = None
+    if isinstance(analysis_results, dict):
+        url = analysis_results.get("url")
+    item = {"index": index, "url": url, "filename": None, "error": None}
+
+    try:
+        _batch_exporter._load(analysis_results, report_data)
+        item["filename"] = _batch_exporter.export_pdf(filename)
+    except Exception as e:
+        item["error"] = str(e)
+    return item
+
+
+def _batch_filenames(output_dir, storage, digits):
+    """Función index -> ruta del PDF de cada sitio de un lote.
+
+    Con storage (report_storage.ReportStorage) cada ruta sale de
+    storage.new_path(), con sus shards y nombres únicos; si no, es un nombre
+    por posición en output_dir, o en el directorio de reportes por defecto.
+    """
+    if storage is not None:
+        if output_dir is not None:
+            raise ValueError("Indique output_dir o storage, no ambos")
+        return lambda index: storage.new_path()
+
+    if output_dir is None:
+        output_dir = REPORTS_DIR
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except Exception:
+            output_dir = FALLBACK_REPORTS_DIR
+    else:
+        os.makedirs(output_dir, exist_ok=True)
+
+    # Un nombre por posición: varios reportes se generan en el mismo segundo
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return lambda index: os.path.join(
+        output_dir, f"seo_report_{timestamp}_{index:0{digits}d}.pdf"
+    )
+
+
+def export_many(
+    results_iterable,
+    workers=None,
+    output_dir=None,
+    report_data=None,
+    chunksize=1,
+    storage=None,
+):
+    """Exporta en paralelo los reportes de muchos sitios.
+
+    Cada proceso del pool mantiene su propio exportador, de modo que los
+    estilos se construyen una vez por proceso y no una vez por sitio.
+    Retorna una lista, en el orden de entrada, con un diccionario por sitio
+    (index, url, filename, error); un sitio con error no detiene el lote.
+    Con storage los PDFs se guardan en ese almacén en lugar de output_dir.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    filename = _batch_filenames(output_dir, storage, 6)
+    tasks = (
+        (index, analysis_results, report_data, filename(index), storage)
+        for index, analysis_results in enumerate(results_iterable)
+    )
+
+    if workers <= 1:
+        return [_export_batch_item(task) for task in tasks]
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_batch_worker
+    ) as executor:
+        return list(executor.map(_export_batch_item, tasks, chunksize=chunksize))
@@ -0,0 +1,255 @@
+"""Exportación del reporte como datos: JSON, CSV y HTML estático.
+
+DataReportExporter toma el mismo contenido que las secciones del PDF
+(resumen ejecutivo, cambios, tablas de métricas, fortalezas, plan de acción
+y próximos pasos) de los métodos de EnhancedReportExporter que lo producen,
+pero no crea flowables ni llama a doc.build: no importa reportlab. Sirve a
+tableros, webhooks y planillas que solo necesitan los datos.
+
+El JSON conserva la estructura de content(); el CSV tiene una fila por fila
+de cada tabla, precedida por la sección y la tabla a la que pertenece; el
+HTML es una página sin dependencias externas con las mismas tablas.
+"""
+
+import csv
+from datetime import datetime
+import html
+import io
+import json
+
+from report_exporter import EnhancedReportExporter
+from report_storage import atomic_writer
+
+FORMATS = ("json", "csv", "html")
+
+ACTION_PLAN_COLUMNS = [
+    "Problema",
+    "Prioridad",
+    "Estado Actual",
+    "Solución Recomendada",
+    "Pasos para Implementar",
+    "Beneficio Esperado",
+]
+
+_HTML_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; margin: 2em auto; max-width: 60em; }
+h1, .subtitle { text-align: center; }
+table { border-collapse: collapse; margin: 0.5em 0 1.5em; width: 100%; }
+th, td { border: 1px solid black; padding: 0.3em 0.6em; text-align: center; }
+th { background: grey; color: whitesmoke; }
+td { background: beige; }
+"""
+
+
+def _table(title, rows):
+    """Tabla del contenido a partir de filas cuyo primer elemento es el encabezado"""
+    return {"title": title, "columns": rows[0], "rows": rows[1:]}
+
+
+class DataReportExporter:
+    """Exporta el contenido del reporte como JSON, CSV o HTML sin maquetar.
+
+    rules, metrics e history se pasan a EnhancedReportExporter, igual que
+    en el reporte PDF.
+    """
+
+    def __init__(
+        self, analysis_results, report_data=None, rules=None, metrics=None, history=None
+    ):
+        self._exporter = EnhancedReportExporter(
+            analysis_results, report_data, rules=rules, metrics=metrics, history=history
+        )
+        self._content = None
+
+    def content(self):
+        """Contenido de todas las secciones, analizado una sola vez"""
+        if self._content is None:
+            self._content = self._build_content()
+        return self._content
+
+    def _build_content(self):
+        exporter = self._exporter
+        exporter._prepare()
+        summary = exporter.summary_data
+        improvements = summary.get("priority_improvements", [])
+        return {
+            "url": exporter.model.url,
+            "analysis_date": exporter._analysis_date,
+            "summary": {
+                key: summary.get(key)
+                for key in (
+                    "overall_status",
+                    "critical_issues",
+                    "moderate_issues",
+                    "minor_issues",
+                    "total_issues",
+                )
+            },
+            "executive_summary": _table(
+                "Resumen Ejecutivo", exporter._get_summary_rows()
+            ),
+            "changes": self._changes_content(),
+            "detailed_metrics": [
+                _table(title, rows) for title, rows, _ in exporter._get_metric_tables()
+            ],
+            "strengths": exporter._identify_strengths(),
+            "action_plan": [
+                self._action_plan_entry(issue)
+                for issue in improvements
+                if isinstance(issue, dict)
+            ],
+            "next_steps": [
+                {"title": title.rstrip(":"), "issues": issues}
+                for title, issues in exporter._get_next_steps_groups(improvements)
+            ],
+        }
+
+    def _changes_content(self):
+        changes = self._exporter._changes
+        if changes is None:
+            return None
+        return {
+            "since": changes["since"],
+            "table": _table("Cambios", self._exporter._get_changes_rows()),
+            "new_issues": changes["new_issues"],
+            "resolved_issues": changes["resolved_issues"],
+        }
+
+    def _action_plan_entry(self, issue):
+        exporter = self._exporter
+        return {
+            "issue": issue.get("issue", "Problema no especificado"),
+            "priority": issue.get("priority", "no especificada"),
+            "current_state": exporter._get_current_state(issue),
+            "solution": exporter._get_technical_solution(issue),
+            "steps": exporter._get_implementation_steps(issue),
+            "benefit": exporter._get_expected_benefit(issue),
+        }
+
+    def _sections(self):
+        """Secciones como tablas: [(título de la sección, [tablas])]"""
+        content = self.content()
+        sections = [("Resumen Ejecutivo", [content["executive_summary"]])]
+
+        changes = content["changes"]
+        if changes is not None:
+            since = datetime.fromisoformat(changes["since"]).strftime("%d/%m/%Y")
+            tables = [changes["table"]]
+            issue_rows = [["Problemas nuevos", i] for i in changes["new_issues"]]
+            issue_rows += [
+                ["Problemas resueltos", i] for i in changes["resolved_issues"]
+            ]
+            if issue_rows:
+                tables.append(
+                    _table("Problemas", [["Cambio", "Problema"]] + issue_rows)
+                )
+            sections.append((f"Cambios desde el {since}", tables))
+
+        sections.append(("Análisis Detallado de Métricas", content["detailed_metrics"]))
+        sections.append(
+            (
+                "Fortalezas del Sitio",
+                [
+                    _table(
+                        "Fortalezas",
+                        [["Fortaleza"]] + [[s] for s in content["strengths"]],
+                    )
+                ],
+            )
+        )
+        action_rows = [
+            [
+                entry["issue"],
+                entry["priority"],
+                entry["current_state"],
+                entry["solution"],
+                " / ".join(entry["steps"]),
+                entry["benefit"],
+            ]
+            for entry in content["action_plan"]
+        ]
+        sections.append(
+            (
+                "Plan de Acción Detallado",
+                [_table("Problemas", [ACTION_PLAN_COLUMNS] + action_rows)],
+            )
+        )
+        next_rows = [
+            [group["title"], issue]
+            for group in content["next_steps"]
+            for issue in group["issues"]
+        ]
+        sections.append(
+            (
+                "Próximos Pasos Recomendados",
+                [_table("Acciones", [["Plazo", "Problema"]] + next_rows)],
+            )
+        )
+        return sections
+
+    def to_json(self):
+        """Contenido del reporte como texto JSON"""
+        return json.dumps(self.content(), ensure_ascii=False, indent=2)
+
+    def to_csv(self):
+        """Tablas del reporte como texto CSV"""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(["Sección", "Tabla"])
+        for section, tables in self._sections():
+            for table in tables:
+                writer.writerow([section, table["title"]] + table["columns"])
+                for row in table["rows"]:
+                    writer.writerow([section, table["title"]] + row)
+        return output.getvalue()
+
+    def to_html(self):
+        """Página HTML estática con las tablas del reporte"""
+        content = self.content()
+        url = content["url"] or "No disponible"
+        parts = [
+            "<!DOCTYPE html>",
+            '<html lang="es">',
+            '<head><meta charset="utf-8">',
+            "<title>Reporte de Análisis SEO</title>",
+            f"<style>{_HTML_STYLE}</style></head>",
+            "<body>",
+            "<h1>Reporte de Análisis SEO</h1>",
+            f'<p class="subtitle">URL Analizada: {html.escape(url)}</p>',
+            f'<p class="subtitle">Fecha de Análisis: {content["analysis_date"]}</p>',
+        ]
+        for section, tables in self._sections():
+            parts.append(f"<h2>{html.escape(section)}</h2>")
+            if not any(table["rows"] for table in tables):
+                parts.append("<p>Sin elementos en esta evaluación.</p>")
+            for table in tables:
+                if not table["rows"]:
+                    continue
+                parts.append(f"<h3>{html.escape(table['title'])}</h3>")
+                parts.append("<table>")
+                header = "".join(f"<th>{html.escape(c)}</th>" for c in table["columns"])
+                parts.append(f"<tr>{header}</tr>")
+                for row in table["rows"]:
+                    cells = "".join(f"<td>{html.escape(str(c))}</td>" for c in row)
+                    parts.append(f"<tr>{cells}</tr>")
+                parts.append("</table>")
+        parts.append("</body></html>")
+        return "\n".join(parts)
+
+    def export_bytes(self, fmt="json"):
+        """Genera el reporte en el formato indicado y retorna sus bytes UTF-8"""
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato desconocido: {fmt}")
+        return getattr(self, f"to_{fmt}")().encode("utf-8")
+
+    def export_to(self, stream, fmt="json"):
+        """Escribe el reporte en un flujo binario"""
+        stream.write(self.export_bytes(fmt))
+        return stream
+
+    def export(self, filename, fmt="json"):
+        """Exporta el reporte a un archivo con escritura atómica"""
+        data = self.export_bytes(fmt)
+        with atomic_writer(filename) as f:
+            f.write(data)
+        return filename
@@ -0,0 +1,157 @@
+"""Historial de análisis por sitio y diferencias entre análisis sucesivos.
+
+SnapshotStore guarda en SQLite, por URL, una instantánea compacta de cada
+análisis: los resultados normalizados del modelo y summary_data, como JSON
+comprimido. diff_snapshots compara una instantánea con la anterior campo por
+campo y conserva solo lo que cambió: problemas nuevos y resueltos, la
+variación del tiempo de carga y del tamaño de página, y el resto de los
+campos modificados.
+"""
+
+from datetime import datetime
+import json
+import sqlite3
+import threading
+import zlib
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_url ON snapshots (url, id);
+"""
+
+# Campos destacados en la sección de cambios, por su ruta en el modelo
+TRACKED_FIELDS = {
+    "performance.load_time.time_seconds": "Tiempo de Carga",
+    "performance.page_size.size_mb": "Tamaño de Página",
+}
+
+# Nombres con que la sección de cambios muestra el resto de los campos. Los
+# que no están aquí (url y los indicadores internos present) no se muestran
+FIELD_LABELS = {
+    "technical_seo.html_structure.has_doctype": "DOCTYPE",
+    "technical_seo.html_structure.has_head": "Etiqueta head",
+    "technical_seo.html_structure.has_html_tag": "Etiqueta html",
+    "technical_seo.ssl_check.has_ssl": "SSL/HTTPS",
+    "technical_seo.robots_txt.exists": "Robots.txt",
+    "technical_seo.sitemap.exists": "Sitemap",
+    "technical_seo.sitemap.url_count": "URLs en el Sitemap",
+    "meta_data.title_tag.content": "Title Tag",
+    "meta_data.title_tag.length": "Longitud del Title Tag",
+    "meta_data.title_tag.optimal_length": "Longitud Óptima del Title Tag",
+    "meta_data.meta_description.length": "Longitud de la Meta Description",
+    "meta_data.meta_description.optimal_length": (
+        "Longitud Óptima de la Meta Description"
+    ),
+    "meta_data.headers.h1": "Headers H1",
+    "meta_data.headers.h2": "Headers H2",
+    "meta_data.headers.h3": "Headers H3",
+    "meta_data.img_alt.with_alt": "Imágenes con Alt Text",
+    "meta_data.img_alt.without_alt": "Imágenes sin Alt Text",
+    "performance.load_time.rating": "Calificación del Tiempo de Carga",
+    "performance.page_size.rating": "Calificación del Tamaño de Página",
+    "performance.status_code.code": "Status Code",
+    "mobile.viewport.is_responsive": "Viewport",
+    "mobile.responsive_design.has_fluid_images": "Imágenes Fluidas",
+    "mobile.responsive_design.has_media_queries": "Media Queries",
+}
+
+
+def _encode(snapshot):
+    data = json.dumps(snapshot, sort_keys=True, separators=(",", ":"))
+    return zlib.compress(data.encode("utf-8"))
+
+
+def _decode(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def _flatten(data, prefix=""):
+    """Aplana un diccionario anidado en {ruta.con.puntos: valor}"""
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def _issues(summary):
+    return [item["issue"] for item in summary.get("priority_improvements", [])]
+
+
+def diff_snapshots(previous, current):
+    """Diferencias entre dos instantáneas ({taken_at, results, summary})"""
+    before = _flatten(previous["results"])
+    after = _flatten(current["results"])
+    changed = {
+        path: (before.get(path), after.get(path))
+        for path in sorted(before.keys() | after.keys())
+        if before.get(path) != after.get(path)
+    }
+
+    previous_issues = _issues(previous["summary"])
+    current_issues = _issues(current["summary"])
+    return {
+        "since": previous["taken_at"],
+        "new_issues": [i for i in current_issues if i not in previous_issues],
+        "resolved_issues": [i for i in previous_issues if i not in current_issues],
+        "total_issues": (
+            previous["summary"].get("total_issues", 0),
+            current["summary"].get("total_issues", 0),
+        ),
+        "tracked": {
+            path: changed.pop(path) for path in TRACKED_FIELDS if path in changed
+        },
+        "fields": changed,
+    }
+
+
+class SnapshotStore:
+    """Instantáneas de análisis por URL en una base SQLite local"""
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def latest(self, url):
+        """Última instantánea guardada para la URL, o None"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT taken_at, data FROM snapshots WHERE url = ? "
+                "ORDER BY id DESC LIMIT 1",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        snapshot = _decode(row[1])
+        snapshot["taken_at"] = row[0]
+        return snapshot
+
+    def save(self, url, results, summary, taken_at=None):
+        """Guarda una instantánea con los resultados normalizados y el resumen"""
+        if taken_at is None:
+            taken_at = datetime.now().isoformat(timespec="seconds")
+        data = _encode({"results": results, "summary": summary})
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO snapshots (url, taken_at, data) VALUES (?, ?, ?)",
+                (url, taken_at, data),
+            )
+        return {
+            "taken_at": taken_at,
+            "results": results,
+            "summary": summary,
+        }
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,134 @@
+"""Instrumentación del renderizado de reportes.
+
+El exportador informa a un MetricsSink la duración de cada fase (análisis,
+cada sección, doc.build y total), el tamaño y las páginas del PDF y
+contadores de resultados. MetricsSink no hace nada; InMemoryMetrics guarda
+contadores e histogramas en el proceso y los expone para ser leídos.
+"""
+
+import re
+import threading
+
+# Límites de los buckets (segundos) para duraciones
+TIMING_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Límites de los buckets para valores (bytes, páginas): 1, 2, 5, 10, ... 5e8
+VALUE_BUCKETS = tuple(
+    base * 10**exponent for exponent in range(9) for base in (1, 2, 5)
+)
+
+
+class MetricsSink:
+    """Destino de métricas del exportador; por defecto las descarta"""
+
+    def timing(self, name, seconds):
+        """Duración de una fase del renderizado"""
+
+    def observe(self, name, value):
+        """Valor medido en un renderizado (tamaño, páginas)"""
+
+    def increment(self, name, value=1):
+        """Suma a un contador"""
+
+
+class Histogram:
+    """Histograma acumulativo con límites fijos"""
+
+    __slots__ = ("bounds", "bucket_counts", "count", "sum")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.bucket_counts = [0] * len(bounds)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.bucket_counts[index] += 1
+                break
+
+    def snapshot(self):
+        cumulative = []
+        running = 0
+        for bound, count in zip(self.bounds, self.bucket_counts):
+            running += count
+            cumulative.append((bound, running))
+        return {"count": self.count, "sum": self.sum, "buckets": cumulative}
+
+
+class InMemoryMetrics(MetricsSink):
+    """Contadores e histogramas en memoria, seguros entre threads"""
+
+    def __init__(self, prefix="seo_report"):
+        self.prefix = prefix
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, name, bounds):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = Histogram(bounds)
+        return histogram
+
+    def timing(self, name, seconds):
+        with self._lock:
+            self._histogram(f"{name}_seconds", TIMING_BUCKETS).add(seconds)
+
+    def observe(self, name, value):
+        with self._lock:
+            self._histogram(name, VALUE_BUCKETS).add(value)
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self):
+        """Copia de los contadores e histogramas actuales"""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {
+                    name: histogram.snapshot()
+                    for name, histogram in self._histograms.items()
+                },
+            }
+
+    def render_text(self):
+        """Métricas en formato de exposición de texto de Prometheus"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = self._metric_name(name)
+            lines.append(f"# TYPE {metric}_total counter")
+            lines.append(f"{metric}_total {value}")
+        for name, histogram in sorted(snapshot["histograms"].items()):
+            metric = self._metric_name(name)
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, count in histogram["buckets"]:
+                lines.append(f'{metric}_bucket{{le="{bound:g}"}} {count}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram["count"]}')
+            lines.append(f"{metric}_sum {histogram['sum']:g}")
+            lines.append(f"{metric}_count {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def _metric_name(self, name):
+        return re.sub(r"[^a-zA-Z0-9_]", "_", f"{self.prefix}_{name}")
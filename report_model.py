@@ -0,0 +1,244 @@
+"""Modelo tipado de los resultados de análisis usado por el reporte.
+
+build_report_model() recorre analysis_results una sola vez, valida los tipos
+de cada campo que el reporte muestra y produce objetos compactos (con
+__slots__) que leen las secciones del reporte. Un payload mal formado se
+rechaza con InvalidResultsError antes de cualquier trabajo de maquetación.
+Los campos ausentes quedan en None para que cada sección aplique su valor
+por defecto.
+"""
+
+from datetime import datetime
+
+
+class InvalidResultsError(ValueError):
+    """Los resultados de análisis no tienen la forma esperada"""
+
+
+def _number(value, where):
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise InvalidResultsError(
+            f"{where} debe ser numérico, no {type(value).__name__}"
+        )
+    return value
+
+
+def _text(value, where):
+    if value is None or isinstance(value, str):
+        return value
+    raise InvalidResultsError(f"{where} debe ser texto, no {type(value).__name__}")
+
+
+def _flag(value, where):
+    if value is None:
+        return False
+    if not isinstance(value, (bool, int)):
+        raise InvalidResultsError(
+            f"{where} debe ser booleano, no {type(value).__name__}"
+        )
+    return bool(value)
+
+
+def _section(raw, where):
+    if raw is None:
+        return {}
+    if not isinstance(raw, dict):
+        raise InvalidResultsError(
+            f"{where} debe ser un objeto, no {type(raw).__name__}"
+        )
+    return raw
+
+
+class _Record:
+    """Base de los registros: FIELDS asocia cada campo con su validador"""
+
+    __slots__ = ("present",)
+    FIELDS = {}
+
+    def __init__(self, raw, where):
+        raw = _section(raw, where)
+        # Las secciones solo cuentan si traen datos, igual que en el análisis
+        self.present = bool(raw)
+        for name, kind in self.FIELDS.items():
+            setattr(self, name, kind(raw.get(name), f"{where}.{name}"))
+
+    def to_dict(self):
+        """Representación canónica con solo los campos del modelo"""
+        return {name: getattr(self, name) for name in ("present", *self.FIELDS)}
+
+
+class HtmlStructure(_Record):
+    __slots__ = ("has_doctype", "has_head", "has_html_tag")
+    FIELDS = {"has_doctype": _flag, "has_head": _flag, "has_html_tag": _flag}
+
+
+class SSLCheck(_Record):
+    __slots__ = ("has_ssl",)
+    FIELDS = {"has_ssl": _flag}
+
+
+class RobotsTxt(_Record):
+    __slots__ = ("exists",)
+    FIELDS = {"exists": _flag}
+
+
+class Sitemap(_Record):
+    __slots__ = ("exists", "url_count")
+    FIELDS = {"exists": _flag, "url_count": _number}
+
+
+class TitleTag(_Record):
+    __slots__ = ("content", "length", "optimal_length")
+    FIELDS = {"content": _text, "length": _number, "optimal_length": _text}
+
+
+class MetaDescription(_Record):
+    __slots__ = ("length", "optimal_length")
+    FIELDS = {"length": _number, "optimal_length": _text}
+
+
+class Headers(_Record):
+    """Cantidad de encabezados por nivel (h1, h2, h3)"""
+
+    __slots__ = ("h1", "h2", "h3")
+    FIELDS = {}
+
+    def __init__(self, raw, where):
+        raw = _section(raw, where)
+        self.present = bool(raw)
+        for level in ("h1", "h2", "h3"):
+            header = _section(raw.get(level), f"{where}.{level}")
+            setattr(self, level, _number(header.get("count"), f"{where}.{level}.count"))
+
+    def to_dict(self):
+        return {"present": self.present, "h1": self.h1, "h2": self.h2, "h3": self.h3}
+
+
+class ImgAlt(_Record):
+    __slots__ = ("with_alt", "without_alt")
+    FIELDS = {"with_alt": _number, "without_alt": _number}
+
+
+class LoadTime(_Record):
+    __slots__ = ("time_seconds", "rating")
+    FIELDS = {"time_seconds": _number, "rating": _text}
+
+
+class PageSize(_Record):
+    __slots__ = ("size_mb", "rating")
+    FIELDS = {"size_mb": _number, "rating": _text}
+
+
+class StatusCode(_Record):
+    __slots__ = ("code",)
+    FIELDS = {"code": _number}
+
+
+class Viewport(_Record):
+    __slots__ = ("is_responsive",)
+    FIELDS = {"is_responsive": _flag}
+
+
+class ResponsiveDesign(_Record):
+    __slots__ = ("has_fluid_images", "has_media_queries")
+    FIELDS = {"has_fluid_images": _flag, "has_media_queries": _flag}
+
+
+class _Group:
+    """Base de las secciones de primer nivel: PARTS asocia clave y registro"""
+
+    __slots__ = ()
+    PARTS = {}
+
+    def __init__(self, raw, where):
+        raw = _section(raw, where)
+        for name, record in self.PARTS.items():
+            setattr(self, name, record(raw.get(name), f"{where}.{name}"))
+
+    def to_dict(self):
+        return {name: getattr(self, name).to_dict() for name in self.PARTS}
+
+
+class TechnicalSEO(_Group):
+    __slots__ = ("html_structure", "ssl_check", "robots_txt", "sitemap")
+    PARTS = {
+        "html_structure": HtmlStructure,
+        "ssl_check": SSLCheck,
+        "robots_txt": RobotsTxt,
+        "sitemap": Sitemap,
+    }
+
+    def __init__(self, raw, where):
+        raw = dict(_section(raw, where))
+        # Un sitemap que no es objeto se informa como no encontrado
+        if not isinstance(raw.get("sitemap"), dict):
+            raw["sitemap"] = None
+        super().__init__(raw, where)
+
+
+class MetaData(_Group):
+    __slots__ = ("title_tag", "meta_description", "headers", "img_alt")
+    PARTS = {
+        "title_tag": TitleTag,
+        "meta_description": MetaDescription,
+        "headers": Headers,
+        "img_alt": ImgAlt,
+    }
+
+
+class Performance(_Group):
+    __slots__ = ("load_time", "page_size", "status_code")
+    PARTS = {"load_time": LoadTime, "page_size": PageSize, "status_code": StatusCode}
+
+
+class Mobile(_Group):
+    __slots__ = ("viewport", "responsive_design")
+    PARTS = {"viewport": Viewport, "responsive_design": ResponsiveDesign}
+
+
+class ReportModel:
+    """Resultados normalizados de un sitio, listos para las secciones"""
+
+    __slots__ = ("url", "technical_seo", "meta_data", "performance", "mobile")
+    SECTIONS = {
+        "technical_seo": TechnicalSEO,
+        "meta_data": MetaData,
+        "performance": Performance,
+        "mobile": Mobile,
+    }
+
+    def __init__(self, raw):
+        if not isinstance(raw, dict):
+            raise InvalidResultsError(
+                f"analysis_results debe ser un objeto, no {type(raw).__name__}"
+            )
+        self.url = _text(raw.get("url"), "url")
+        for name, section in self.SECTIONS.items():
+            setattr(self, name, section(raw.get(name), name))
+
+    def to_dict(self):
+        """Representación canónica con solo los campos que usa el reporte"""
+        data = {"url": self.url}
+        for name in self.SECTIONS:
+            data[name] = getattr(self, name).to_dict()
+        return data
+
+
+def build_report_model(analysis_results):
+    """Valida analysis_results y construye su modelo tipado"""
+    return ReportModel(analysis_results)
+
+
+def read_analysis_date(analysis_results):
+    """Fecha del análisis informada en los resultados (ISO 8601), o None"""
+    raw = _text(analysis_results.get("analysis_date"), "analysis_date")
+    if raw is None:
+        return None
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        raise InvalidResultsError(
+            f"analysis_date debe ser una fecha ISO 8601, no {raw!r}"
+        ) from None
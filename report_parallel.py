@@ -0,0 +1,340 @@
+"""Renderizado en paralelo de reportes muy largos.
+
+Un solo doc.build usa un solo núcleo. ParallelReportExporter analiza los
+resultados una vez y divide el reporte en partes independientes: portada y
+resumen, métricas detalladas, y el plan de acción en tramos de
+chunk_size problemas. Cada parte se maqueta en un proceso distinto y los
+PDFs se unen con pypdf. Sobre el resultado se agregan la numeración
+continua de páginas ("Página N de M") y un índice de marcadores que
+enlaza al comienzo de cada parte.
+
+pypdf (pip install pypdf) es una dependencia opcional de este módulo:
+sin él, o con un solo proceso, las mismas partes se maquetan en serie en un
+único documento con la misma numeración e índice, y no se crea el pool de
+procesos. ParallelReportExporter.parallel indica qué camino se usa. Cada
+parte comienza en una página nueva, así que ambos caminos dan las mismas
+páginas. El PDF unido conserva los metadatos de la primera parte (título,
+asunto, palabras clave y, en modo determinista, las fechas fijas).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import io
+import math
+import os
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from reportlab.platypus import (
+    Flowable,
+    PageBreak,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+)
+
+from report_exporter import REPORT_SECTIONS, REPORT_VARIANTS, EnhancedReportExporter
+from report_rules import DEFAULT_RULES
+from report_storage import atomic_writer
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+# Problemas del plan de acción por parte, si no se indica chunk_size
+DEFAULT_CHUNK_SIZE = 200
+
+_SECTIONS = {
+    name: (method, space_after) for name, method, space_after, _ in REPORT_SECTIONS
+}
+
+# Partes fijas del reporte: (título en el índice, secciones)
+_LEADING_PARTS = (
+    ("Resumen", ("cover", "plan_title", "executive_summary", "changes")),
+    ("Métricas Detalladas", ("detailed_metrics", "strengths")),
+)
+
+
+def _draw_page_number(canv, number, total):
+    """Pie de página con la numeración continua del reporte"""
+    width, _ = canv._pagesize
+    canv.saveState()
+    canv.setFont("Helvetica", 9)
+    canv.drawCentredString(width / 2, 30, f"Página {number} de {total}")
+    canv.restoreState()
+
+
+class _NumberedCanvas(canvas.Canvas):
+    """Canvas que demora las páginas hasta conocer el total para numerarlas.
+
+    Los marcadores también se demoran: hasta save() las páginas no existen
+    en el documento y un marcador quedaría en la primera.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._page_states = []
+        self._outline = []  # (índice de página, clave, título)
+
+    def add_outline_entry(self, key, title):
+        self._outline.append((len(self._page_states), key, title))
+
+    def showPage(self):
+        self._page_states.append(dict(self.__dict__))
+        self._startPage()
+
+    def save(self):
+        total = len(self._page_states)
+        outline = self._outline
+        for index, state in enumerate(self._page_states):
+            self.__dict__.update(state)
+            for page, key, title in outline:
+                if page == index:
+                    self.bookmarkPage(key)
+                    self.addOutlineEntry(title, key, level=0)
+            _draw_page_number(self, self._pageNumber, total)
+            super().showPage()
+        super().save()
+
+
+class _OutlineEntry(Flowable):
+    """Marcador del índice en la posición donde se maqueta"""
+
+    def __init__(self, key, title):
+        super().__init__()
+        self.key = key
+        self.title = title
+
+    def wrap(self, available_width, available_height):
+        return 0, 0
+
+    def draw(self):
+        if isinstance(self.canv, _NumberedCanvas):
+            self.canv.add_outline_entry(self.key, self.title)
+        else:
+            self.canv.bookmarkPage(self.key)
+            self.canv.addOutlineEntry(self.title, self.key, level=0)
+
+
+def plan_parts(summary_data, chunk_size=DEFAULT_CHUNK_SIZE, variant="basic"):
+    """Divide el reporte en partes: [(título, entradas)].
+
+    Cada entrada es ("section", nombre) o ("action_plan", inicio, fin) con el
+    tramo de priority_improvements que la parte maqueta. Solo se incluyen
+    las secciones de la variante.
+    """
+    included = REPORT_VARIANTS[variant]["sections"]
+    parts = []
+    for title, sections in _LEADING_PARTS:
+        entries = [("section", name) for name in sections if name in included]
+        if entries:
+            parts.append((title, entries))
+    if "action_plan" in included:
+        issues = len(summary_data.get("priority_improvements", []))
+        chunk_size = max(1, chunk_size)
+        starts = list(range(0, issues, chunk_size)) or [0]
+        for start in starts:
+            stop = min(start + chunk_size, issues)
+            title = "Plan de Acción"
+            if len(starts) > 1:
+                title = f"Plan de Acción ({start + 1}-{stop})"
+            parts.append((title, [("action_plan", start, stop)]))
+    # Las secciones finales siguen a la anterior en la misma página
+    for name, title in (("next_steps", "Próximos Pasos"), ("appendix", "Anexo")):
+        if name in included:
+            if parts:
+                parts[-1][1].append(("section", name))
+            else:
+                parts.append((title, [("section", name)]))
+    return parts
+
+
+def _part_story(exporter, entries):
+    """Flowables de una parte del reporte"""
+    story = []
+    improvements = exporter.summary_data.get("priority_improvements", [])
+    for entry in entries:
+        if entry[0] == "section":
+            method, space_after = _SECTIONS[entry[1]]
+            elements = getattr(exporter, method)()
+        else:
+            _, start, stop = entry
+            space_after = 20 if stop == len(improvements) else 0
+            elements = exporter._create_action_plan_items(improvements[start:stop])
+            if not improvements:
+                # Sin problemas la sección completa es el aviso correspondiente
+                elements = exporter._create_detailed_action_plan()
+            elif start == 0:
+                heading = Paragraph(
+                    "Plan de Acción Detallado", exporter.custom_styles["Heading2"]
+                )
+                elements.insert(0, heading)
+        story.extend(elements)
+        if space_after and elements:
+            story.append(Spacer(1, space_after))
+    return story
+
+
+def _part_exporter(analysis_results, report_data, profile, rules, state):
+    """Exportador con el análisis ya hecho por el proceso principal"""
+    exporter = EnhancedReportExporter(
+        analysis_results,
+        report_data,
+        rules=rules,
+        profile=profile,
+        deterministic=state["deterministic"],
+        variant=state["variant"],
+    )
+    exporter.summary_data = state["summary_data"]
+    exporter._analysis_date = state["analysis_date"]
+    exporter._changes = state["changes"]
+    return exporter
+
+
+def _render_part(analysis_results, report_data, profile, rules, state, entries):
+    """Maqueta una parte en un proceso del pool; retorna sus bytes"""
+    exporter = _part_exporter(analysis_results, report_data, profile, rules, state)
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, **exporter._doc_options())
+    doc.build(_part_story(exporter, entries))
+    return buffer.getvalue()
+
+
+class ParallelReportExporter:
+    """Exporta un reporte largo maquetando sus partes en paralelo.
+
+    Sin executor se crea un ProcessPoolExecutor propio de workers procesos,
+    que close() libera; sin pypdf no se crea y todo se maqueta en serie.
+    """
+
+    def __init__(
+        self,
+        workers=None,
+        executor=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        profile="default",
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.profile = profile
+        self._owns_executor = (
+            executor is None and self.workers > 1 and pypdf is not None
+        )
+        self._executor = executor
+        if self._owns_executor:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        # Si las partes se maquetan en procesos y se unen con pypdf
+        self.parallel = pypdf is not None and self._executor is not None
+
+    def export_pdf(self, filename, analysis_results, report_data=None, **options):
+        """Exporta el reporte a un archivo PDF"""
+        with atomic_writer(filename) as f:
+            self.export_to(f, analysis_results, report_data, **options)
+        return filename
+
+    def export_pdf_bytes(self, analysis_results, report_data=None, **options):
+        """Genera el reporte en memoria y retorna su contenido"""
+        buffer = io.BytesIO()
+        self.export_to(buffer, analysis_results, report_data, **options)
+        return buffer.getvalue()
+
+    def export_to(self, stream, analysis_results, report_data=None, **options):
+        """Escribe el reporte en un flujo binario.
+
+        options se pasa a EnhancedReportExporter (rules, history, metrics,
+        deterministic, variant).
+        """
+        exporter = EnhancedReportExporter(
+            analysis_results, report_data, profile=self.profile, **options
+        )
+        exporter._prepare()
+        state = {
+            "summary_data": exporter.summary_data,
+            "analysis_date": exporter._analysis_date,
+            "changes": exporter._changes,
+            "deterministic": exporter.deterministic,
+            "variant": exporter.variant,
+        }
+        chunk_size = self.chunk_size
+        issues = len(exporter.summary_data["priority_improvements"])
+        if self.parallel and issues > chunk_size * self.workers:
+            # Tramos más grandes si hay más problemas que procesos x chunk_size
+            chunk_size = math.ceil(issues / self.workers)
+        parts = plan_parts(exporter.summary_data, chunk_size, exporter.variant)
+
+        if self.parallel and len(parts) > 1:
+            self._render_parallel(stream, exporter, state, parts)
+        else:
+            self._render_serial(stream, exporter, parts)
+        return stream
+
+    def _render_serial(self, stream, exporter, parts):
+        story = []
+        for index, (title, entries) in enumerate(parts):
+            if index:
+                story.append(PageBreak())
+            story.append(_OutlineEntry(f"part{index}", title))
+            story.extend(_part_story(exporter, entries))
+        doc = SimpleDocTemplate(stream, pagesize=letter, **exporter._doc_options())
+        doc.build(story, canvasmaker=_NumberedCanvas)
+
+    def _render_parallel(self, stream, exporter, state, parts):
+        # El catálogo por defecto ya está en cada proceso: no se envía
+        rules = None if exporter.rules is DEFAULT_RULES else exporter.rules
+        futures = [
+            self._executor.submit(
+                _render_part,
+                exporter.results,
+                exporter.report,
+                self.profile,
+                rules,
+                state,
+                entries,
+            )
+            for _, entries in parts
+        ]
+
+        writer = pypdf.PdfWriter()
+        starts = []
+        metadata = None
+        for future in futures:
+            starts.append(len(writer.pages))
+            reader = pypdf.PdfReader(io.BytesIO(future.result()))
+            if metadata is None:
+                metadata = reader.metadata
+            for page in reader.pages:
+                writer.add_page(page)
+
+        total = len(writer.pages)
+        overlay = pypdf.PdfReader(io.BytesIO(_page_numbers_pdf(total)))
+        for page, numbers in zip(writer.pages, overlay.pages):
+            page.merge_page(numbers)
+        for (title, _), start in zip(parts, starts):
+            writer.add_outline_item(title, start)
+        if metadata:
+            # Los metadatos de reportlab de la primera parte: las partes los
+            # comparten y en modo determinista traen las fechas fijas
+            writer.add_metadata(dict(metadata))
+        writer.write(stream)
+
+    def close(self):
+        """Libera el executor si fue creado por este exportador"""
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _page_numbers_pdf(total):
+    """PDF de total páginas con solo el pie de numeración"""
+    buffer = io.BytesIO()
+    canv = canvas.Canvas(buffer, pagesize=letter)
+    for number in range(1, total + 1):
+        _draw_page_number(canv, number, total)
+        canv.showPage()
+    canv.save()
+    return buffer.getvalue()
@@ -0,0 +1,232 @@
+"""Generación de reportes en lote a partir de volcados JSON Lines.
+
+Cada línea del archivo es un analysis_results. El archivo se lee de a una
+línea, y el trabajo pasa por tres etapas:
+
+* lectura y parseo: un thread lee, parsea y valida cada línea;
+* renderizado: un pool de procesos, o el propio proceso con workers=1,
+  genera cada PDF;
+* salida: cada PDF se escribe en disco apenas termina.
+
+Una cola acotada separa el parseo del renderizado, y la cantidad de renders
+en curso también está acotada. Así la memoria depende de esos límites y no
+del tamaño del volcado.
+"""
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+import json
+import os
+import queue
+import threading
+import time
+
+from report_exporter import _batch_filenames, _export_batch_item, _init_batch_worker
+from report_model import build_report_model
+
+# Marca de fin de la cola entre el parseo y el renderizado
+_END = object()
+
+
+class PipelineStats:
+    """Contadores del avance del pipeline"""
+
+    def __init__(self, total_bytes=None):
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.invalid = 0
+        self.rendered = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+
+    @property
+    def completed(self):
+        return self.invalid + self.rendered + self.failed
+
+    def snapshot(self):
+        """Copia de los contadores con el avance y la velocidad actuales"""
+        elapsed = time.perf_counter() - self.started
+        fraction = None
+        if self.total_bytes:
+            fraction = min(self.bytes_read / self.total_bytes, 1.0)
+        return {
+            "bytes_read": self.bytes_read,
+            "total_bytes": self.total_bytes,
+            "fraction": fraction,
+            "lines_read": self.lines_read,
+            "invalid": self.invalid,
+            "rendered": self.rendered,
+            "failed": self.failed,
+            "completed": self.completed,
+            "elapsed_seconds": elapsed,
+            "reports_per_second": self.completed / elapsed if elapsed else 0.0,
+        }
+
+
+def _parse_line(line, line_number):
+    """Parsea y valida una línea; retorna (resultados, error)"""
+    try:
+        analysis_results = json.loads(line)
+    except ValueError as e:
+        return None, f"Línea {line_number}: JSON inválido ({e})"
+    if not isinstance(analysis_results, dict):
+        return None, f"Línea {line_number}: se esperaba un objeto JSON"
+    try:
+        build_report_model(analysis_results)
+    except Exception as e:
+        return None, f"Línea {line_number}: {e}"
+    return analysis_results, None
+
+
+def _put(records, item, stop):
+    """Encola esperando lugar, salvo que el pipeline se haya detenido"""
+    while not stop.is_set():
+        try:
+            records.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+def _read_records(path, records, stats, stop):
+    """Etapa de lectura: encola cada registro válido o su error"""
+    try:
+        with open(path, "rb") as f:
+            for line_number, line in enumerate(f, start=1):
+                if stop.is_set():
+                    break
+                stats.bytes_read += len(line)
+                if not line.strip():
+                    continue
+                stats.lines_read += 1
+                analysis_results, error = _parse_line(line, line_number)
+                # Bloquea mientras el renderizado va atrasado
+                _put(records, (line_number, analysis_results, error), stop)
+    except Exception as e:
+        _put(records, (0, None, f"Error leyendo {path}: {e}"), stop)
+    finally:
+        _put(records, _END, stop)
+
+
+def run_jsonl_pipeline(
+    path,
+    output_dir=None,
+    workers=None,
+    report_data=None,
+    queue_size=64,
+    max_in_flight=None,
+    on_result=None,
+    progress=None,
+    progress_interval=1.0,
+    storage=None,
+):
+    """Genera un reporte por cada línea de un archivo JSON Lines.
+
+    on_result recibe, a medida que terminan, los diccionarios por sitio de
+    export_many (index, url, filename, error), con index igual al número de
+    línea. progress recibe PipelineStats.snapshot() cada progress_interval
+    segundos y al final. Retorna el snapshot final; los resultados por sitio
+    no se acumulan para que la memoria no crezca con el archivo. Con
+    storage (report_storage.ReportStorage) los PDFs se guardan en ese
+    almacén en lugar de output_dir.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = workers * 2
+
+    filename = _batch_filenames(output_dir, storage, 9)
+
+    try:
+        total_bytes = os.path.getsize(path)
+    except OSError:
+        total_bytes = None
+    stats = PipelineStats(total_bytes)
+    records = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=_read_records,
+        args=(path, records, stats, stop),
+        name="jsonl-reader",
+        daemon=True,
+    )
+
+    last_progress = time.perf_counter()
+
+    def finish(item):
+        nonlocal last_progress
+        if item["error"] is None:
+            stats.rendered += 1
+        else:
+            stats.failed += 1
+        if on_result is not None:
+            on_result(item)
+        if progress is not None:
+            now = time.perf_counter()
+            if now - last_progress >= progress_interval:
+                last_progress = now
+                progress(stats.snapshot())
+
+    def task(line_number, analysis_results):
+        return (
+            line_number,
+            analysis_results,
+            report_data,
+            filename(line_number),
+            storage,
+        )
+
+    def invalid(line_number, error):
+        stats.invalid += 1
+        if on_result is not None:
+            on_result(
+                {"index": line_number, "url": None, "filename": None, "error": error}
+            )
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_batch_worker
+        )
+    reader.start()
+    in_flight = set()
+    try:
+        while True:
+            item = records.get()
+            if item is _END:
+                break
+            line_number, analysis_results, error = item
+            if error is not None:
+                invalid(line_number, error)
+                continue
+
+            if executor is None:
+                finish(_export_batch_item(task(line_number, analysis_results)))
+                continue
+
+            # Acota los renders pendientes: el resto espera en la cola
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(future.result())
+            in_flight.add(
+                executor.submit(_export_batch_item, task(line_number, analysis_results))
+            )
+
+        for future in as_completed(in_flight):
+            finish(future.result())
+    finally:
+        stop.set()
+        reader.join()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    snapshot = stats.snapshot()
+    if progress is not None:
+        progress(snapshot)
+    return snapshot
@@ -0,0 +1,366 @@
+"""Pool de procesos de render que se reciclan solos.
+
+Los procesos que renderizan miles de reportes crecen en memoria (cachés de
+reportlab, fragmentación del heap). En RecyclingPool cada proceso cuenta sus
+tareas y mide su RSS después de cada una; al pasar max_tasks_per_worker o
+max_rss_mb avisa junto con el resultado y termina, y el pool lo reemplaza
+por uno nuevo. Las tareas se asignan de a una por proceso, así que el pool
+siempre sabe cuál está en curso: si un proceso muere en medio de una
+(por ejemplo por el OOM killer) su tarea se reasigna a otro proceso.
+"""
+
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import resource
+import sys
+import threading
+
+from report_exporter import REPORT_VARIANTS, EnhancedReportExporter, warm_up
+
+# Veces que se reasigna una tarea cuyo proceso murió antes de fallarla
+DEFAULT_MAX_RETRIES = 1
+
+
+def _current_rss():
+    """RSS actual del proceso en bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Sin /proc solo se conoce el pico: en bytes en macOS, en KiB en el resto
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _default_context():
+    """Contexto de los procesos del pool: forkserver, o spawn donde no existe.
+
+    Los reemplazos se crean desde el thread despachador mientras corren otros
+    threads (por ejemplo los de report_service); con fork el hijo podría
+    heredar tomado un lock de alguno de ellos y quedar bloqueado.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _worker_main(conn, max_tasks, max_rss, warm, deterministic):
+    """Bucle de un proceso: renderiza tareas hasta que le toca reciclarse"""
+    if warm:
+        warm_up(check_reports_dir=False)
+    exporter = EnhancedReportExporter({}, None, deterministic=deterministic)
+    tasks = 0
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        task_id, analysis_results, report_data, filename, variant = task
+        try:
+            exporter._load(analysis_results, report_data)
+            exporter.variant = variant
+            if filename is None:
+                value = exporter.export_pdf_bytes()
+            else:
+                value = exporter.export_pdf(filename)
+            ok = True
+        except Exception as e:
+            value, ok = str(e), False
+        tasks += 1
+
+        rss = _current_rss()
+        reason = None
+        if max_tasks and tasks >= max_tasks:
+            reason = "tasks"
+        elif max_rss and rss >= max_rss:
+            reason = "rss"
+        conn.send((task_id, ok, value, rss, tasks, reason))
+        if reason is not None:
+            break
+    conn.close()
+
+
+def _settle(future, result=None, exception=None):
+    """Completa un Future; uno ya resuelto no debe detener al despachador"""
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+class _Worker:
+    """Estado de un proceso del pool visto desde el proceso principal"""
+
+    __slots__ = ("process", "conn", "task", "tasks", "rss", "retiring", "closed")
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.task = None
+        self.tasks = 0
+        self.rss = 0
+        self.retiring = False
+        self.closed = False
+
+
+class RecyclingPool:
+    """Pool de procesos de render con reciclado por tareas y por memoria.
+
+    submit() retorna un concurrent.futures.Future con los bytes del PDF, o
+    con el nombre del archivo si se pasa filename, de la variante indicada
+    (ver REPORT_VARIANTS). stats() expone los contadores del pool para
+    ajustar los límites. Con deterministic los procesos renderizan en modo
+    determinista (ver content_hash). Sin mp_context los procesos se crean
+    con forkserver (o spawn), nunca con fork.
+    """
+
+    def __init__(
+        self,
+        workers=None,
+        max_tasks_per_worker=1000,
+        max_rss_mb=None,
+        max_retries=DEFAULT_MAX_RETRIES,
+        warm=True,
+        mp_context=None,
+        deterministic=False,
+    ):
+        self.size = workers or os.cpu_count() or 1
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_rss_mb = max_rss_mb
+        self.max_retries = max_retries
+        self.warm = warm
+        self.deterministic = deterministic
+        self._context = mp_context or _default_context()
+
+        self._pending = deque()
+        self._futures = {}
+        self._attempts = {}
+        self._workers = []
+        self._next_task_id = 0
+        self._lock = threading.Lock()
+        self._closing = False
+        self._wake_reader, self._wake_writer = self._context.Pipe(duplex=False)
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.requeued = 0
+        self.workers_started = 0
+        self.recycled = {"tasks": 0, "rss": 0}
+        self.crashed = 0
+        self.cancelled = 0
+
+        for _ in range(self.size):
+            self._workers.append(self._start_worker())
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="recycling-pool", daemon=True
+        )
+        self._dispatcher.start()
+
+    def _start_worker(self):
+        parent_conn, child_conn = self._context.Pipe()
+        max_rss = self.max_rss_mb * 1024 * 1024 if self.max_rss_mb else None
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                self.max_tasks_per_worker,
+                max_rss,
+                self.warm,
+                self.deterministic,
+            ),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self.workers_started += 1
+        return _Worker(process, parent_conn)
+
+    def submit(
+        self, analysis_results, report_data=None, filename=None, variant="basic"
+    ):
+        """Encola un reporte y retorna el Future de su resultado"""
+        if variant not in REPORT_VARIANTS:
+            raise ValueError(f"Variante de reporte desconocida: {variant}")
+        future = Future()
+        with self._lock:
+            if self._closing:
+                raise RuntimeError("El pool está cerrado")
+            task_id = self._next_task_id
+            self._next_task_id += 1
+            self._futures[task_id] = future
+            self._pending.append(
+                (task_id, analysis_results, report_data, filename, variant)
+            )
+            self.submitted += 1
+        self._wake_writer.send_bytes(b"")
+        return future
+
+    def _dispatch(self):
+        """Asigna tareas a procesos libres y procesa resultados y caídas"""
+        while True:
+            with self._lock:
+                if self._closing and not self._pending and not self._busy():
+                    break
+                self._assign()
+                conns = [w.conn for w in self._workers]
+                sentinels = [w.process.sentinel for w in self._workers]
+
+            ready = wait(conns + sentinels + [self._wake_reader])
+            if self._wake_reader in ready:
+                while self._wake_reader.poll():
+                    self._wake_reader.recv_bytes()
+
+            with self._lock:
+                for index, worker in enumerate(list(self._workers)):
+                    if worker.conn in ready:
+                        self._receive(worker)
+                    if (
+                        worker.process.sentinel in ready
+                        or worker.retiring
+                        or worker.closed
+                    ):
+                        self._replace(index, worker)
+
+        for worker in self._workers:
+            self._stop(worker)
+
+    def _busy(self):
+        return any(worker.task is not None for worker in self._workers)
+
+    def _next_task(self):
+        """Saca de la cola la próxima tarea cuyo Future no fue cancelado"""
+        while self._pending:
+            task = self._pending.popleft()
+            future = self._futures[task[0]]
+            # Una tarea reasignada ya está en curso; las demás pasan a estarlo
+            if future.running() or future.set_running_or_notify_cancel():
+                return task
+            self._futures.pop(task[0])
+            self._attempts.pop(task[0], None)
+            self.cancelled += 1
+        return None
+
+    def _assign(self):
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if worker.task is None and not worker.retiring:
+                task = self._next_task()
+                if task is None:
+                    return
+                try:
+                    worker.conn.send(task)
+                    worker.task = task
+                except (OSError, ValueError):
+                    # El proceso ya no está: la tarea vuelve a la cola
+                    self._pending.appendleft(task)
+
+    def _receive(self, worker):
+        try:
+            task_id, ok, value, rss, tasks, reason = worker.conn.recv()
+        except (EOFError, OSError):
+            # El proceso cerró su extremo: está terminando
+            worker.closed = True
+            return
+        worker.task = None
+        worker.rss = rss
+        worker.tasks = tasks
+        self._attempts.pop(task_id, None)
+        future = self._futures.pop(task_id)
+        if ok:
+            self.completed += 1
+            _settle(future, value)
+        else:
+            self.failed += 1
+            _settle(future, exception=Exception(value))
+        if reason is not None:
+            worker.retiring = True
+            self.recycled[reason] += 1
+
+    def _replace(self, index, worker):
+        """Reemplaza un proceso que se recicló o murió, reasignando su tarea"""
+        if worker.process.is_alive() and not (worker.retiring or worker.closed):
+            return
+        if not worker.closed and worker.conn.poll():
+            # Resultado que llegó junto con la salida del proceso
+            self._receive(worker)
+        if not worker.retiring:
+            self.crashed += 1
+        if worker.task is not None:
+            self._handover(worker.task, worker.process.exitcode)
+        self._stop(worker)
+        self._workers[index] = self._start_worker()
+
+    def _handover(self, task, exitcode):
+        """Devuelve al frente de la cola la tarea de un proceso caído"""
+        task_id = task[0]
+        attempts = self._attempts.get(task_id, 0) + 1
+        if attempts > self.max_retries:
+            self._attempts.pop(task_id, None)
+            self.failed += 1
+            _settle(
+                self._futures.pop(task_id),
+                exception=Exception(
+                    f"El proceso de render terminó con código {exitcode}"
+                ),
+            )
+            return
+        self._attempts[task_id] = attempts
+        self.requeued += 1
+        self._pending.appendleft(task)
+
+    def _stop(self, worker):
+        try:
+            worker.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        worker.conn.close()
+
+    def stats(self):
+        """Contadores del pool y estado de cada proceso"""
+        with self._lock:
+            return {
+                "workers": self.size,
+                "workers_started": self.workers_started,
+                "recycled_by_tasks": self.recycled["tasks"],
+                "recycled_by_rss": self.recycled["rss"],
+                "crashed": self.crashed,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "requeued": self.requeued,
+                "cancelled": self.cancelled,
+                "pending": len(self._pending),
+                "in_flight": sum(1 for w in self._workers if w.task is not None),
+                "worker_rss_bytes": [w.rss for w in self._workers],
+                "worker_tasks": [w.tasks for w in self._workers],
+            }
+
+    def close(self):
+        """Termina las tareas encoladas y detiene los procesos"""
+        with self._lock:
+            self._closing = True
+        self._wake_writer.send_bytes(b"")
+        self._dispatcher.join()
+        self._wake_reader.close()
+        self._wake_writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,353 @@
+"""Reporte de portafolio: un solo PDF con el resumen de muchos sitios.
+
+Los resultados de cada sitio se recorren una sola vez para llevar sus
+campos a columnas de NumPy (performance, meta datos, mobile y los campos
+que revisa el catálogo de reglas). Los conteos de problemas, percentiles y
+rankings se calculan luego con operaciones vectorizadas sobre todas las
+columnas a la vez, en lugar de correr _analyze_issues por sitio y combinar
+diccionarios.
+"""
+
+import io
+from datetime import datetime
+
+import numpy as np
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
+
+from report_crawl import _get_crawl_table_style, _shorten
+from report_exporter import _get_style_registry
+from report_model import InvalidResultsError, build_report_model
+from report_rules import DEFAULT_RULES, SEVERITIES
+
+PERCENTILES = (50, 75, 90, 95)
+
+# Orden de las severidades en la matriz de problemas por sitio
+_SEVERITY_ORDER = tuple(SEVERITIES)
+
+
+def _vector_predicate(predicate, values):
+    """Aplica un predicado del catálogo a una columna de valores"""
+    spec = getattr(predicate, "spec", None)
+    if spec is None:
+        return np.frompyfunc(predicate, 1, 1)(values).astype(bool)
+    kind = spec[0]
+    if kind == "is_falsy":
+        return ~np.frompyfunc(bool, 1, 1)(values).astype(bool)
+    if kind == "equals":
+        return np.asarray(values == spec[1], dtype=bool)
+    if kind == "greater_than":
+        return _numeric_column(values) > spec[1]
+    return np.frompyfunc(predicate, 1, 1)(values).astype(bool)
+
+
+def _numeric_column(values):
+    """Convierte una columna de objetos a float, con NaN si no es numérico"""
+    return np.fromiter(
+        (
+            (
+                value
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+                else np.nan
+            )
+            for value in values
+        ),
+        dtype=float,
+        count=len(values),
+    )
+
+
+def _float(value):
+    return np.nan if value is None else value
+
+
+class PortfolioColumns:
+    """Campos de todos los sitios del portafolio, uno por columna"""
+
+    def __init__(self, sites, rules=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.invalid_sites = 0
+
+        urls = []
+        load_time, page_size, status_code = [], [], []
+        title_ok, description_ok, single_h1, without_alt = [], [], [], []
+        viewport, fluid_images = [], []
+        fields = []
+        for index, analysis_results in enumerate(sites):
+            try:
+                model = build_report_model(analysis_results)
+            except InvalidResultsError:
+                self.invalid_sites += 1
+                continue
+
+            urls.append(model.url or f"Sitio {index + 1}")
+            perf, meta, mobile = model.performance, model.meta_data, model.mobile
+            load_time.append(_float(perf.load_time.time_seconds))
+            page_size.append(_float(perf.page_size.size_mb))
+            status_code.append(_float(perf.status_code.code))
+            title_ok.append(meta.title_tag.optimal_length == "good")
+            description_ok.append(meta.meta_description.optimal_length == "good")
+            single_h1.append(meta.headers.h1 == 1)
+            without_alt.append(_float(meta.img_alt.without_alt))
+            viewport.append(mobile.viewport.is_responsive)
+            fluid_images.append(mobile.responsive_design.has_fluid_images)
+            fields.append(self.rules.field_values(analysis_results))
+
+        self.urls = urls
+        self.size = len(urls)
+        self.load_time = np.array(load_time, dtype=float)
+        self.page_size = np.array(page_size, dtype=float)
+        self.status_code = np.array(status_code, dtype=float)
+        self.title_ok = np.array(title_ok, dtype=bool)
+        self.description_ok = np.array(description_ok, dtype=bool)
+        self.single_h1 = np.array(single_h1, dtype=bool)
+        self.without_alt = np.array(without_alt, dtype=float)
+        self.viewport = np.array(viewport, dtype=bool)
+        self.fluid_images = np.array(fluid_images, dtype=bool)
+        self.issues = self._issue_matrix(fields)
+
+    def _issue_matrix(self, fields):
+        """Matriz sitios x reglas: True si la regla detecta el problema"""
+        checked = self.rules.checked_rules
+        matrix = np.zeros((self.size, len(checked)), dtype=bool)
+        for column, rule in enumerate(checked):
+            present = np.fromiter(
+                (site[column][0] for site in fields), dtype=bool, count=self.size
+            )
+            values = np.fromiter(
+                (site[column][1] for site in fields), dtype=object, count=self.size
+            )
+            matrix[:, column] = present & _vector_predicate(rule.predicate, values)
+        return matrix
+
+
+class PortfolioSummary:
+    """Conteos, percentiles y rankings calculados sobre las columnas"""
+
+    def __init__(self, columns, top=10):
+        self.columns = columns
+        self.top = top
+        checked = columns.rules.checked_rules
+
+        # Problemas por sitio y severidad: matriz de problemas x pertenencia
+        severity_of = np.zeros((len(checked), len(_SEVERITY_ORDER)), dtype=np.int64)
+        for row, rule in enumerate(checked):
+            severity_of[row, _SEVERITY_ORDER.index(rule.severity)] = 1
+        by_severity = columns.issues.astype(np.int64) @ severity_of
+        self.site_issues = {
+            SEVERITIES[severity][0]: by_severity[:, index]
+            for index, severity in enumerate(_SEVERITY_ORDER)
+        }
+        self.site_total_issues = by_severity.sum(axis=1)
+        self.sites_per_issue = columns.issues.sum(axis=0)
+
+    def totals(self):
+        """Totales del portafolio con la forma de summary_data"""
+        columns = self.columns
+        critical = self.site_issues["critical_issues"]
+        moderate = self.site_issues["moderate_issues"]
+        return {
+            "sites": columns.size,
+            "invalid_sites": columns.invalid_sites,
+            "critical_issues": int(critical.sum()),
+            "moderate_issues": int(moderate.sum()),
+            "minor_issues": int(self.site_issues["minor_issues"].sum()),
+            "total_issues": int(self.site_total_issues.sum()),
+            "sites_critical": int(np.count_nonzero(critical)),
+            "sites_moderate": int(np.count_nonzero((critical == 0) & (moderate > 0))),
+            "sites_good": int(np.count_nonzero((critical == 0) & (moderate == 0))),
+        }
+
+    def issue_frequency(self):
+        """(regla, sitios afectados) de la más frecuente a la menos"""
+        checked = self.columns.rules.checked_rules
+        order = np.argsort(-self.sites_per_issue, kind="stable")
+        return [
+            (checked[index], int(self.sites_per_issue[index]))
+            for index in order
+            if self.sites_per_issue[index]
+        ]
+
+    def percentiles(self, column):
+        """Percentiles de una columna ignorando los valores ausentes"""
+        valid = column[~np.isnan(column)]
+        if not valid.size:
+            return None
+        return dict(zip(PERCENTILES, np.percentile(valid, PERCENTILES)))
+
+    def rates(self):
+        """(elemento, sitios OK) para los chequeos de meta datos y mobile"""
+        columns = self.columns
+        return [
+            ("Title Tag", int(np.count_nonzero(columns.title_ok))),
+            ("Meta Description", int(np.count_nonzero(columns.description_ok))),
+            ("Un solo H1", int(np.count_nonzero(columns.single_h1))),
+            ("Alt Text", int(np.count_nonzero(columns.without_alt == 0))),
+            ("Viewport", int(np.count_nonzero(columns.viewport))),
+            ("Responsive Design", int(np.count_nonzero(columns.fluid_images))),
+            ("Status Code 200", int(np.count_nonzero(columns.status_code == 200))),
+        ]
+
+    def ranking(self, column):
+        """Índices de los sitios con mayor valor en la columna, de mayor a menor"""
+        column = np.asarray(column, dtype=float)
+        candidates = np.flatnonzero(~np.isnan(column))
+        if candidates.size > self.top:
+            # Solo se ordenan los top candidatos, no todo el portafolio
+            partition = np.argpartition(column[candidates], -self.top)[-self.top :]
+            candidates = candidates[partition]
+        order = np.argsort(-column[candidates], kind="stable")
+        return candidates[order]
+
+
+class PortfolioReportExporter:
+    """Exporta un reporte agregado de muchos sitios"""
+
+    def __init__(self, sites, rules=None, title="Reporte de Portafolio SEO", top=10):
+        self.columns = PortfolioColumns(sites, rules)
+        self.summary = PortfolioSummary(self.columns, top)
+        self.title = title
+        registry = _get_style_registry()
+        self.custom_styles = registry["custom_styles"]
+        self.table_style = registry["table_style"]
+
+    def export_pdf(self, filename):
+        """Exporta el reporte de portafolio a un archivo PDF"""
+        self._build_pdf(filename)
+        return filename
+
+    def export_to(self, stream):
+        """Escribe el reporte de portafolio en un flujo binario"""
+        self._build_pdf(stream)
+        return stream
+
+    def export_pdf_bytes(self):
+        """Genera el reporte de portafolio en memoria y retorna su contenido"""
+        buffer = io.BytesIO()
+        self._build_pdf(buffer)
+        return buffer.getvalue()
+
+    def _build_pdf(self, target):
+        doc = SimpleDocTemplate(target, pagesize=letter)
+        doc.build(self._build_story())
+
+    def _build_story(self):
+        story = [
+            Paragraph(self.title, self.custom_styles["Title"]),
+            Paragraph(
+                f"Fecha de Análisis: {datetime.now().strftime('%d/%m/%Y')}",
+                self.custom_styles["Normal"],
+            ),
+            Spacer(1, 20),
+        ]
+        for section in (
+            self._create_totals_section,
+            self._create_issue_frequency_section,
+            self._create_performance_section,
+            self._create_rates_section,
+            self._create_rankings_section,
+        ):
+            story.extend(section())
+            story.append(Spacer(1, 20))
+        return story
+
+    def _create_totals_section(self):
+        totals = self.summary.totals()
+        average = totals["total_issues"] / totals["sites"] if totals["sites"] else 0
+        data = [
+            ["Métrica", "Valor"],
+            ["Sitios analizados", str(totals["sites"])],
+            ["Sitios con datos inválidos", str(totals["invalid_sites"])],
+            ["Necesitan mejoras críticas", str(totals["sites_critical"])],
+            ["Necesitan mejoras", str(totals["sites_moderate"])],
+            ["En buen estado", str(totals["sites_good"])],
+            ["Problemas Críticos", str(totals["critical_issues"])],
+            ["Problemas Moderados", str(totals["moderate_issues"])],
+            ["Problemas Menores", str(totals["minor_issues"])],
+            ["Problemas por sitio (promedio)", f"{average:.2f}"],
+        ]
+        return [
+            Paragraph("Resumen del Portafolio", self.custom_styles["Heading2"]),
+            Table(data, colWidths=[250, 150], style=self.table_style),
+        ]
+
+    def _create_issue_frequency_section(self):
+        sites = self.columns.size
+        data = [["Problema", "Prioridad", "Sitios", "%"]]
+        for rule, count in self.summary.issue_frequency():
+            data.append(
+                [
+                    rule.issue,
+                    SEVERITIES[rule.severity][1],
+                    str(count),
+                    f"{100 * count / sites:.1f}%",
+                ]
+            )
+        if len(data) == 1:
+            data.append(["Sin problemas detectados", "", "", ""])
+        return [
+            Paragraph("Problemas más Frecuentes", self.custom_styles["Heading2"]),
+            Table(data, colWidths=[230, 80, 60, 60], style=_get_crawl_table_style()),
+        ]
+
+    def _create_performance_section(self):
+        data = [["Métrica"] + [f"p{p}" for p in PERCENTILES]]
+        for label, column, unit in (
+            ("Tiempo de Carga", self.columns.load_time, "s"),
+            ("Tamaño de Página", self.columns.page_size, "MB"),
+        ):
+            values = self.summary.percentiles(column)
+            if values is None:
+                data.append([label] + ["N/A"] * len(PERCENTILES))
+            else:
+                data.append([label] + [f"{values[p]:.2f} {unit}" for p in PERCENTILES])
+        return [
+            Paragraph("Performance", self.custom_styles["Heading2"]),
+            Table(data, colWidths=[130, 80, 80, 80, 80], style=self.table_style),
+        ]
+
+    def _create_rates_section(self):
+        sites = self.columns.size
+        data = [["Elemento", "Sitios OK", "%"]]
+        for label, count in self.summary.rates():
+            share = f"{100 * count / sites:.1f}%" if sites else "N/A"
+            data.append([label, str(count), share])
+        return [
+            Paragraph("Meta Datos y Mobile", self.custom_styles["Heading2"]),
+            Table(data, colWidths=[200, 100, 100], style=self.table_style),
+        ]
+
+    def _create_rankings_section(self):
+        columns, summary = self.columns, self.summary
+        story = [Paragraph("Rankings", self.custom_styles["Heading2"])]
+        rankings = (
+            (
+                "Sitios más lentos",
+                ["Sitio", "Tiempo de Carga"],
+                columns.load_time,
+                lambda index: f"{columns.load_time[index]:.2f} segundos",
+            ),
+            (
+                "Páginas más pesadas",
+                ["Sitio", "Tamaño de Página"],
+                columns.page_size,
+                lambda index: f"{columns.page_size[index]:.2f} MB",
+            ),
+            (
+                "Sitios con más problemas",
+                ["Sitio", "Problemas"],
+                summary.site_total_issues,
+                lambda index: str(summary.site_total_issues[index]),
+            ),
+        )
+        for title, header, column, describe in rankings:
+            data = [header]
+            for index in summary.ranking(column):
+                data.append([_shorten(columns.urls[index]), describe(index)])
+            if len(data) == 1:
+                data.append(["Sin datos", ""])
+            story.append(Paragraph(title, self.custom_styles["Heading3"]))
+            story.append(
+                Table(data, colWidths=[300, 120], style=_get_crawl_table_style())
+            )
+        return story
@@ -0,0 +1,319 @@
+"""Catálogo declarativo de reglas para el análisis de problemas SEO.
+
+Cada regla indica la ruta del campo a revisar dentro de analysis_results,
+el predicado que lo marca como problema, su severidad y los textos que el
+reporte muestra para ese problema. El catálogo se compila una sola vez en
+accesores que se evalúan sobre los resultados en una sola pasada.
+"""
+
+import hashlib
+import json
+
+# Severidad -> (contador en summary_data, prioridad mostrada en el reporte)
+SEVERITIES = {
+    "critical": ("critical_issues", "alta"),
+    "moderate": ("moderate_issues", "media"),
+    "minor": ("minor_issues", "baja"),
+}
+
+
+# Cada predicado del catálogo lleva en spec su forma declarativa, para que
+# otros evaluadores (por ejemplo el de columnas del portafolio) lo apliquen
+# sin llamarlo valor por valor. Son objetos de módulo o instancias, no
+# closures, para que el catálogo se pueda enviar a otro proceso.
+
+
+def is_falsy(value):
+    """Predicado: el campo está ausente o es falso"""
+    return not value
+
+
+is_falsy.spec = ("is_falsy",)
+
+
+class _Equals:
+    __slots__ = ("expected", "spec")
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.spec = ("equals", expected)
+
+    def __call__(self, value):
+        return value == self.expected
+
+
+class _GreaterThan:
+    __slots__ = ("limit", "spec")
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.spec = ("greater_than", limit)
+
+    def __call__(self, value):
+        return value is not None and value > self.limit
+
+
+def equals(expected):
+    """Predicado: el campo es igual al valor indicado"""
+    return _Equals(expected)
+
+
+def greater_than(limit):
+    """Predicado: el campo supera el límite indicado (ausente no cuenta)"""
+    return _GreaterThan(limit)
+
+
+class _StateFields(dict):
+    """Campos del contenedor de la regla; los ausentes se muestran como 0"""
+
+    def __missing__(self, key):
+        return 0
+
+
+class IssueRule:
+    """Regla del catálogo: qué campo revisar, cuándo es un problema y qué decir.
+
+    La regla solo se evalúa si el diccionario que contiene el campo existe y
+    no está vacío. Las reglas sin ruta aportan únicamente sus textos.
+    """
+
+    __slots__ = (
+        "issue",
+        "path",
+        "predicate",
+        "default",
+        "severity",
+        "current_state",
+        "solution",
+        "steps",
+        "benefit",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        issue,
+        path,
+        predicate,
+        severity,
+        default=None,
+        current_state=None,
+        solution=None,
+        steps=(),
+        benefit=None,
+    ):
+        if severity not in SEVERITIES:
+            raise ValueError(f"Severidad desconocida: {severity}")
+        self.issue = issue
+        self.path = tuple(path) if path is not None else None
+        self.predicate = predicate
+        self.default = default
+        self.severity = severity
+        self.current_state = current_state
+        self.solution = solution
+        self.steps = tuple(steps)
+        self.benefit = benefit
+
+    def describe_state(self, container):
+        """Completa el texto de estado actual con los campos del contenedor"""
+        if self.current_state is None:
+            return None
+        return self.current_state.format_map(_StateFields(container or {}))
+
+
+def _compile_getter(path):
+    """Compila la ruta de un contenedor en una función de acceso directo"""
+    if len(path) == 1:
+        (key,) = path
+
+        def getter(results):
+            value = results.get(key)
+            return value if isinstance(value, dict) else None
+
+        return getter
+
+    def getter(results):
+        value = results
+        for key in path:
+            value = value.get(key)
+            if not isinstance(value, dict):
+                return None
+        return value
+
+    return getter
+
+
+def _catalog_fingerprint(rules):
+    """Hash de la severidad y los textos de cada regla, en orden de catálogo"""
+    texts = [
+        [
+            rule.issue,
+            rule.severity,
+            rule.current_state,
+            rule.solution,
+            list(rule.steps),
+            rule.benefit,
+        ]
+        for rule in rules
+    ]
+    encoded = json.dumps(texts, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CompiledRules:
+    """Catálogo compilado: accesores únicos por contenedor y chequeos en orden"""
+
+    __slots__ = (
+        "rules",
+        "by_issue",
+        "checked_rules",
+        "fingerprint",
+        "_getters",
+        "_getter_slots",
+        "_checks",
+    )
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        self.by_issue = {rule.issue: rule for rule in self.rules}
+        self._getters = []
+        self._getter_slots = {}
+        self._checks = []
+
+        for rule in self.rules:
+            if rule.path is None:
+                continue
+            parents, field = rule.path[:-1], rule.path[-1]
+            slot = self._getter_slots.get(parents)
+            if slot is None:
+                slot = len(self._getters)
+                self._getters.append(_compile_getter(parents))
+                self._getter_slots[parents] = slot
+            self._checks.append((slot, field, rule.default, rule.predicate, rule))
+        # Reglas que se evalúan, en el orden de sus chequeos
+        self.checked_rules = tuple(check[-1] for check in self._checks)
+        # Hash de los textos que el reporte muestra de cada regla
+        self.fingerprint = _catalog_fingerprint(self.rules)
+
+    def __reduce__(self):
+        # Los accesores compilados no se serializan: se vuelven a compilar
+        return (CompiledRules, (self.rules,))
+
+    def evaluate(self, results):
+        """Retorna, en orden de catálogo, las reglas que detectan un problema.
+
+        Cada contenedor se resuelve una sola vez aunque varias reglas lo usen.
+        """
+        containers = [getter(results) for getter in self._getters]
+        found = []
+        for slot, field, default, predicate, rule in self._checks:
+            container = containers[slot]
+            if container and predicate(container.get(field, default)):
+                found.append(rule)
+        return found
+
+    def field_values(self, results):
+        """Campos que revisa cada chequeo, sin aplicar los predicados.
+
+        Retorna una lista de (presente, valor) en el orden de checked_rules;
+        presente es falso si el contenedor del campo no existe o está vacío,
+        y en ese caso la regla no se aplica.
+        """
+        containers = [getter(results) for getter in self._getters]
+        values = []
+        for slot, field, default, _, _ in self._checks:
+            container = containers[slot]
+            if container:
+                values.append((True, container.get(field, default)))
+            else:
+                values.append((False, None))
+        return values
+
+    def current_state(self, rule, results):
+        """Texto del estado actual de una regla según los resultados"""
+        container = None
+        if rule.path is not None:
+            container = self._getters[self._getter_slots[rule.path[:-1]]](results)
+        return rule.describe_state(container)
+
+
+ISSUE_RULES = (
+    IssueRule(
+        "Falta declaración DOCTYPE",
+        path=("technical_seo", "html_structure", "has_doctype"),
+        predicate=is_falsy,
+        default=False,
+        severity="moderate",
+        current_state="Página sin declaración DOCTYPE",
+        solution="Agregar <!DOCTYPE html> al inicio del documento",
+        steps=(
+            "Agregar <!DOCTYPE html> al inicio del documento",
+            "Verificar la estructura HTML",
+            "Validar el código HTML",
+        ),
+        benefit="Mejor renderizado y compatibilidad cross-browser",
+    ),
+    IssueRule(
+        "Título no optimizado",
+        path=("meta_data", "title_tag", "optimal_length"),
+        predicate=equals("bad"),
+        severity="critical",
+        current_state="Título actual tiene {length} caracteres",
+        solution="Ajustar el título a una longitud entre 30-60 caracteres",
+        steps=(
+            "Revisar el título actual",
+            "Incluir palabras clave principales",
+            "Ajustar longitud entre 30-60 caracteres",
+            "Verificar relevancia para la página",
+        ),
+        benefit="Mejor posicionamiento en búsquedas y mayor CTR",
+    ),
+    IssueRule(
+        "Imágenes sin texto alternativo",
+        path=("meta_data", "img_alt", "without_alt"),
+        predicate=greater_than(0),
+        default=0,
+        severity="minor",
+        current_state="{without_alt} imágenes sin alt text",
+        solution="Agregar atributos alt descriptivos a las imágenes",
+        steps=(
+            "Identificar imágenes sin alt",
+            "Agregar descripciones relevantes",
+            "Verificar la accesibilidad",
+        ),
+        benefit="Mejor accesibilidad y SEO para imágenes",
+    ),
+    IssueRule(
+        "Diseño no responsive",
+        path=("mobile", "responsive_design", "has_fluid_images"),
+        predicate=is_falsy,
+        default=False,
+        severity="critical",
+        current_state="Faltan elementos responsive en la página",
+        solution="Implementar media queries y hacer las imágenes fluidas",
+        steps=(
+            "Implementar meta viewport",
+            "Agregar media queries",
+            "Hacer las imágenes fluidas",
+            "Probar en diferentes dispositivos",
+        ),
+        benefit="Mejor experiencia en móviles y mejor ranking mobile",
+    ),
+    # Sin ruta: por ahora no se detecta, pero el plan de acción tiene sus textos
+    IssueRule(
+        "Meta descripción no optimizada",
+        path=None,
+        predicate=None,
+        severity="moderate",
+        solution="Ajustar la meta descripción a una longitud entre 120-155 caracteres",
+        steps=(
+            "Revisar la meta descripción actual",
+            "Incluir llamada a la acción clara",
+            "Ajustar longitud entre 120-155 caracteres",
+            "Verificar relevancia y atractivo",
+        ),
+        benefit="Mayor visibilidad en resultados de búsqueda y CTR mejorado",
+    ),
+)
+
+DEFAULT_RULES = CompiledRules(ISSUE_RULES)
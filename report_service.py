@@ -0,0 +1,290 @@
+"""Servicio HTTP local de renderizado de reportes, solo con la biblioteca estándar.
+
+POST /render recibe un analysis_results en JSON y responde el PDF, de la
+variante indicada en ?variant= (basic por defecto, ver REPORT_VARIANTS). Los
+renders corren en un RecyclingPool detrás de una cola acotada: con la cola
+llena el servicio responde 503 en lugar de acumular trabajo. Pedidos
+idénticos que llegan mientras el primero se renderiza esperan ese mismo
+render en lugar de repetir doc.build. GET /stats expone los contadores del
+servicio y del pool.
+
+Con --deterministic los PDFs son reproducibles byte a byte (los resultados
+deben traer analysis_date) y cada respuesta lleva un ETag calculado sin
+maquetar: un pedido con If-None-Match igual recibe 304 sin renderizar.
+
+Uso: python report_service.py --port 8080 --workers 4
+"""
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hashlib
+import json
+import threading
+from urllib.parse import parse_qs
+
+from report_exporter import REPORT_VARIANTS, ReportRenderer
+from report_model import InvalidResultsError, build_report_model
+from report_pool import RecyclingPool
+
+# Tamaño máximo del cuerpo de un pedido
+DEFAULT_MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# Segundos que un pedido espera su PDF antes de responder 504
+DEFAULT_RENDER_TIMEOUT = 120
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class ServiceBusy(Exception):
+    """La cola de renders del servicio está llena"""
+
+
+def request_key(analysis_results):
+    """Clave de un pedido: hash del JSON canónico de sus resultados"""
+    encoded = json.dumps(
+        analysis_results, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _etag_matches(if_none_match, etag):
+    """Indica si un encabezado If-None-Match incluye etag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class RenderService:
+    """Renders en un pool con cola acotada y unión de pedidos idénticos.
+
+    Con deterministic el pool propio renderiza en modo determinista y etag()
+    calcula el ETag de un pedido sin renderizarlo. Un pool recibido debe
+    haberse creado con el mismo modo.
+    """
+
+    def __init__(
+        self,
+        pool=None,
+        workers=None,
+        max_pending=None,
+        timeout=None,
+        deterministic=False,
+    ):
+        self._owns_pool = pool is None
+        self.pool = pool or RecyclingPool(workers=workers, deterministic=deterministic)
+        self.max_pending = max_pending or self.pool.size * 4
+        self.timeout = timeout or DEFAULT_RENDER_TIMEOUT
+        self.deterministic = deterministic
+        self._hashers = {}
+        if deterministic:
+            self._hashers = {
+                variant: ReportRenderer(deterministic=True, variant=variant)
+                for variant in REPORT_VARIANTS
+            }
+        self._in_flight = {}
+        self._lock = threading.RLock()
+        self.requests = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.not_modified = 0
+
+    def etag(self, analysis_results, variant="basic"):
+        """ETag del PDF de un pedido, sin renderizarlo; None sin modo determinista"""
+        if not self._hashers:
+            return None
+        return f'"{self._hashers[variant].content_hash(analysis_results)}"'
+
+    def is_not_modified(self, etag, if_none_match):
+        """Indica si el cliente ya tiene el PDF de etag (respuesta 304)"""
+        if etag is None or not _etag_matches(if_none_match, etag):
+            return False
+        with self._lock:
+            self.not_modified += 1
+        return True
+
+    def render(self, analysis_results, variant="basic"):
+        """Retorna el PDF, compartiendo el render con pedidos idénticos"""
+        if variant not in REPORT_VARIANTS:
+            raise ValueError(f"Variante de reporte desconocida: {variant}")
+        key = (variant, request_key(analysis_results))
+        with self._lock:
+            self.requests += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                if len(self._in_flight) >= self.max_pending:
+                    self.rejected += 1
+                    raise ServiceBusy("La cola de renders está llena")
+                future = self.pool.submit(analysis_results, variant=variant)
+                self._in_flight[key] = future
+                # Un pedido que llega después del render no lo reutiliza
+                future.add_done_callback(lambda _, key=key: self._finish(key))
+        return future.result(timeout=self.timeout)
+
+    def _finish(self, key):
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def stats(self):
+        """Contadores del servicio y del pool"""
+        with self._lock:
+            stats = {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+                "not_modified": self.not_modified,
+                "in_flight": len(self._in_flight),
+                "max_pending": self.max_pending,
+            }
+        stats["pool"] = self.pool.stats()
+        return stats
+
+    def close(self):
+        if self._owns_pool:
+            self.pool.close()
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """Atiende POST /render y GET /stats con el RenderService del servidor"""
+
+    server_version = "SEOReportService/1.0"
+
+    def do_POST(self):
+        path, _, query = self.path.partition("?")
+        if path != "/render":
+            self._send_json(404, {"error": "Ruta no encontrada"})
+            return
+        variant = parse_qs(query).get("variant", ["basic"])[-1]
+        if variant not in REPORT_VARIANTS:
+            self._send_json(
+                400, {"error": f"Variante de reporte desconocida: {variant}"}
+            )
+            return
+
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self._send_json(411, {"error": "Falta Content-Length"})
+            return
+        try:
+            length = int(length)
+        except ValueError:
+            self._send_json(400, {"error": "Content-Length inválido"})
+            return
+        if length > self.server.max_body_bytes:
+            self._send_json(413, {"error": "El cuerpo del pedido es demasiado grande"})
+            return
+
+        try:
+            analysis_results = json.loads(self.rfile.read(length))
+            # Un payload mal formado se rechaza antes de ocupar la cola
+            build_report_model(analysis_results)
+            etag = self.server.service.etag(analysis_results, variant)
+        except (ValueError, InvalidResultsError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        if self.server.service.is_not_modified(etag, self.headers.get("If-None-Match")):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        try:
+            pdf_bytes = self.server.service.render(analysis_results, variant)
+        except ServiceBusy as e:
+            self._send_json(503, {"error": str(e)}, {"Retry-After": "1"})
+            return
+        except TimeoutError:
+            self._send_json(504, {"error": "El render no terminó a tiempo"})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(pdf_bytes)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        for start in range(0, len(pdf_bytes), _CHUNK_SIZE):
+            self.wfile.write(pdf_bytes[start : start + _CHUNK_SIZE])
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.server.service.stats())
+        else:
+            self._send_json(404, {"error": "Ruta no encontrada"})
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Las trazas de acceso siguen la misma opción que el exportador
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class RenderServer(ThreadingHTTPServer):
+    """Servidor HTTP con un thread por conexión y un RenderService"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        service,
+        max_body_bytes=DEFAULT_MAX_BODY_BYTES,
+        verbose=False,
+    ):
+        super().__init__(address, RenderRequestHandler)
+        self.service = service
+        self.max_body_bytes = max_body_bytes
+        self.verbose = verbose
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-pending", type=int)
+    parser.add_argument("--max-tasks-per-worker", type=int, default=1000)
+    parser.add_argument("--max-rss-mb", type=int)
+    parser.add_argument("--deterministic", action="store_true")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    pool = RecyclingPool(
+        workers=args.workers,
+        max_tasks_per_worker=args.max_tasks_per_worker,
+        max_rss_mb=args.max_rss_mb,
+        deterministic=args.deterministic,
+    )
+    service = RenderService(
+        pool, max_pending=args.max_pending, deterministic=args.deterministic
+    )
+    server = RenderServer((args.host, args.port), service, verbose=args.verbose)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Almacenamiento de los PDFs generados.
+
+ReportStorage asigna a cada reporte un nombre que no colisiona aunque se
+generen muchos en el mismo segundo y en varios procesos, y lo reparte en
+subdirectorios por fecha o por hash para que ningún directorio crezca sin
+límite. Los PDFs se escriben en un archivo temporal del mismo directorio y
+se renombran con os.replace al terminar, así que quien lee nunca ve un PDF
+a medio escribir.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+import os
+import threading
+import uuid
+
+# Distribución de los archivos bajo el directorio raíz
+LAYOUTS = ("flat", "date", "hash")
+
+# Cuándo forzar a disco: nunca, el archivo antes de renombrarlo, o además
+# el directorio después de renombrarlo (sobrevive a un corte de energía)
+FSYNC_POLICIES = ("none", "file", "full")
+
+
+def _fsync_directory(directory):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_writer(path, fsync="none"):
+    """Abre un temporal junto a path y lo renombra a path al cerrar sin error"""
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Política de fsync desconocida: {fsync}")
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{uuid.uuid4().hex}.tmp")
+    # Como un open() común, con los permisos 0666 menos la umask del proceso
+    # (mkstemp crearía 0600); O_EXCL evita pisar el temporal de otro escritor
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            if fsync != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if fsync == "full":
+        _fsync_directory(directory)
+
+
+class ReportStorage:
+    """Directorio de reportes con nombres únicos, shards y escritura atómica.
+
+    layout "date" usa raíz/AAAA/MM/DD, "hash" dos niveles de 256
+    subdirectorios tomados del identificador único y "flat" la raíz misma.
+    Cada subdirectorio se crea una sola vez por instancia.
+    """
+
+    def __init__(self, root, layout="date", fsync="none", prefix="seo_report"):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Distribución desconocida: {layout}")
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync desconocida: {fsync}")
+        self.root = root
+        self.layout = layout
+        self.fsync = fsync
+        self.prefix = prefix
+        self._ready_dirs = set()
+        self._lock = threading.Lock()
+        self._ensure_dir(root)
+
+    def __getstate__(self):
+        # Se envía a los procesos de trabajo sin el lock; cada proceso
+        # vuelve a verificar sus subdirectorios
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_ready_dirs"] = set()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _ensure_dir(self, directory):
+        if directory in self._ready_dirs:
+            return
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._ready_dirs.add(directory)
+
+    def new_path(self, now=None, token=None):
+        """Reserva la ruta de un reporte nuevo, creando su shard si hace falta.
+
+        Con token (por ejemplo el hash del contenido) el nombre es
+        prefijo_token.pdf: el mismo token siempre da el mismo nombre.
+        """
+        if now is None:
+            now = datetime.now()
+        if token is None:
+            token = uuid.uuid4().hex
+            name = f"{self.prefix}_{now.strftime('%Y%m%d_%H%M%S')}_{token[:12]}.pdf"
+        else:
+            name = f"{self.prefix}_{token}.pdf"
+
+        if self.layout == "date":
+            directory = os.path.join(
+                self.root, now.strftime("%Y"), now.strftime("%m"), now.strftime("%d")
+            )
+        elif self.layout == "hash":
+            directory = os.path.join(self.root, token[:2], token[2:4])
+        else:
+            directory = self.root
+        self._ensure_dir(directory)
+        return os.path.join(directory, name)
+
+    def open(self, path):
+        """Escritor atómico de path con la política de fsync del almacén"""
+        return atomic_writer(path, self.fsync)
+
+    def write(self, pdf_bytes, now=None, token=None):
+        """Guarda un PDF ya renderizado en una ruta nueva y la retorna"""
+        path = self.new_path(now, token)
+        with self.open(path) as f:
+            f.write(pdf_bytes)
+        return path